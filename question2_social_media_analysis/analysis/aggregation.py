@@ -0,0 +1,233 @@
+# question2_social_media_analysis/analysis/aggregation.py
+
+import numpy as np
+import pandas as pd
+
+# Most cells x distinct values of a measure counted in rank histograms, which give medians from the
+# cells; beyond this, medians come from sorting the measure's values instead
+HISTOGRAM_LIMIT = 5_000_000
+
+class AggregationCube:
+    """Per-group statistics of some measures for any grouping of some dimensions, from one scan
+
+    Each dimension is factorized once and the rows are scanned once to
+    build cells, one per combination of dimension values that occurs
+    (missing values are a level of their own), holding the count, mean,
+    sum of squared deviations, min and max of every measure, and a
+    histogram of its values' ranks, from which medians roll up too. Any
+    grouping of the dimensions is then rolled up from the cells, whose
+    number does not grow with the rows, so adding breakdowns costs next
+    to nothing. A measure with too many distinct values for histograms
+    gets its medians from one sort of its values, shared by every grouping.
+    Results match DataFrame.groupby(..., observed=True) with sort=True.
+    """
+
+    def __init__(self, df, dimensions, measures):
+        self.dimensions = [dimension for dimension in dimensions if dimension in df.columns]
+        self.measures = [measure for measure in measures if measure in df.columns]
+        self.levels = {}
+        cell_key = np.zeros(len(df), dtype=np.int64)
+        for dimension in self.dimensions:
+            codes, uniques = pd.factorize(df[dimension], sort=True)
+            self.levels[dimension] = uniques
+            # Shift so missing values (-1) become level 0
+            cell_key = cell_key * (len(uniques) + 1) + codes + 1
+        row_cells, cell_keys = pd.factorize(cell_key)
+        # The smallest integers that hold the cell numbers, which numpy sorts stably by radix
+        self.row_cells = row_cells.astype(np.min_scalar_type(max(len(cell_keys) - 1, 0)))
+        self.cell_rows = np.bincount(self.row_cells, minlength=len(cell_keys))
+
+        # Level (0 = missing) of every dimension for every cell, from the mixed-radix key
+        self.cell_levels = {}
+        for dimension in reversed(self.dimensions):
+            radix = len(self.levels[dimension]) + 1
+            self.cell_levels[dimension] = cell_keys % radix
+            cell_keys = cell_keys // radix
+
+        order = np.argsort(self.row_cells, kind='stable')
+        starts = np.r_[0, np.cumsum(self.cell_rows)[:-1]]
+        self.values = {}
+        self.cells = {}
+        # Statistics come back in a float32 measure's own dtype, as groupby returns them
+        self.result_dtypes = {}
+        for measure in self.measures:
+            values = df[measure].to_numpy(dtype=float, na_value=np.nan)
+            self.values[measure] = values
+            self.result_dtypes[measure] = np.float32 if df[measure].dtype == np.float32 else np.float64
+            self.cells[measure] = self._cell_statistics(values, order, starts)
+        self._value_order = {}
+        self._medians = {}
+
+    def _cell_statistics(self, values, order, starts):
+        valid = ~np.isnan(values)
+        cells = len(self.cell_rows)
+        ranks, distinct = pd.factorize(values, sort=True)
+        histogram = None
+        if cells * len(distinct) <= HISTOGRAM_LIMIT:
+            histogram = np.bincount(self.row_cells[valid].astype(np.int64) * len(distinct) + ranks[valid],
+                                    minlength=cells * len(distinct)).reshape(cells, len(distinct))
+        count = np.bincount(self.row_cells, weights=valid, minlength=cells)
+        total = np.bincount(self.row_cells, weights=np.where(valid, values, 0), minlength=cells)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+        deviations = np.where(valid, values - mean[self.row_cells], 0) ** 2
+        m2 = np.bincount(self.row_cells, weights=deviations, minlength=cells)
+        sorted_values = values[order]
+        nonempty = self.cell_rows > 0
+        minimum = np.full(cells, np.inf)
+        maximum = np.full(cells, -np.inf)
+        minimum[nonempty] = np.minimum.reduceat(np.where(np.isnan(sorted_values), np.inf, sorted_values),
+                                                starts[nonempty])
+        maximum[nonempty] = np.maximum.reduceat(np.where(np.isnan(sorted_values), -np.inf, sorted_values),
+                                                starts[nonempty])
+        return {'count': count, 'mean': mean, 'm2': m2, 'min': minimum, 'max': maximum,
+                'histogram': histogram, 'distinct': distinct}
+
+    def _groups(self, by):
+        """Group number of every cell for the grouping `by` (-1 where a dimension is missing), and the group index"""
+        group = np.zeros(len(self.cell_rows), dtype=np.int64)
+        included = np.ones(len(self.cell_rows), dtype=bool)
+        for dimension in by:
+            levels = self.cell_levels[dimension]
+            included &= levels > 0
+            group = group * len(self.levels[dimension]) + (levels - 1)
+        group = np.where(included, group, -1)
+        present, group = np.unique(group, return_inverse=True)
+        group = group.reshape(-1)
+        if len(present) and present[0] == -1:
+            group, present = group - 1, present[1:]
+
+        # Back from group numbers to the dimension levels, for the index
+        labels = []
+        remainder = present
+        for dimension in reversed(by):
+            size = len(self.levels[dimension])
+            labels.append(self.levels[dimension].take(remainder % size))
+            remainder = remainder // size
+        labels.reverse()
+        if len(by) == 1:
+            index = pd.Index(labels[0], name=by[0])
+        else:
+            index = pd.MultiIndex.from_arrays(labels, names=by)
+        return group, index
+
+    def _rollup(self, measure, group, groups):
+        cells = self.cells[measure]
+        included = group >= 0
+        cell_group = group[included]
+
+        def total(weights):
+            return np.bincount(cell_group, weights=weights[included], minlength=groups)
+
+        count = total(cells['count'])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total(np.nan_to_num(cells['mean'] * cells['count'])) / count
+            # Chan et al.: within-cell deviations plus the spread of the cell means
+            spread = cells['count'][included] * (np.nan_to_num(cells['mean'][included]) - mean[cell_group]) ** 2
+            m2 = total(cells['m2']) + np.bincount(cell_group, weights=np.nan_to_num(spread), minlength=groups)
+            std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+        minimum = np.full(groups, np.inf)
+        maximum = np.full(groups, -np.inf)
+        np.minimum.at(minimum, cell_group, cells['min'][included])
+        np.maximum.at(maximum, cell_group, cells['max'][included])
+        empty = count == 0
+        return {'count': count.astype(np.int64), 'mean': mean, 'std': std, 'm2': m2,
+                'min': np.where(empty, np.nan, minimum), 'max': np.where(empty, np.nan, maximum)}
+
+    def _median(self, measure, by, group, groups):
+        key = (measure, tuple(by))
+        if key not in self._medians and self.cells[measure]['histogram'] is not None:
+            self._medians[key] = self._histogram_median(measure, group, groups)
+        if key not in self._medians:
+            if measure not in self._value_order:
+                values = self.values[measure]
+                # NaNs sort last and are cut off
+                self._value_order[measure] = np.argsort(values, kind='stable')[:int((~np.isnan(values)).sum())]
+            by_value = self._value_order[measure]
+            row_group = group[self.row_cells[by_value]]
+            by_value, row_group = by_value[row_group >= 0], row_group[row_group >= 0]
+            # A stable sort by group leaves each group's values in order; on small integers it is a radix sort
+            by_group = np.argsort(row_group.astype(np.min_scalar_type(max(groups - 1, 0))), kind='stable')
+            sorted_values = self.values[measure][by_value[by_group]]
+            count = np.bincount(row_group, minlength=groups)
+            starts = np.r_[0, np.cumsum(count)[:-1]]
+            medians = np.full(groups, np.nan)
+            nonempty = count > 0
+            low = sorted_values[starts[nonempty] + (count[nonempty] - 1) // 2]
+            high = sorted_values[starts[nonempty] + count[nonempty] // 2]
+            medians[nonempty] = (low + high) / 2
+            self._medians[key] = medians
+        return self._medians[key]
+
+    def _histogram_median(self, measure, group, groups):
+        """Medians from the groups' rank histograms, each the sum of its cells'"""
+        cells = self.cells[measure]
+        included = group >= 0
+        histogram = np.zeros((groups, len(cells['distinct'])), dtype=np.int64)
+        np.add.at(histogram, group[included], cells['histogram'][included])
+        medians = np.full(groups, np.nan)
+        if histogram.shape[1] == 0:
+            return medians
+        cumulative = histogram.cumsum(axis=1)
+        count = cumulative[:, -1]
+        # Rank of the value at each middle position: the number of ranks whose cumulative count is not past it
+        low = (cumulative <= ((count - 1) // 2)[:, None]).sum(axis=1)
+        high = (cumulative <= (count // 2)[:, None]).sum(axis=1)
+        nonempty = count > 0
+        distinct = np.asarray(cells['distinct'], dtype=float)
+        medians[nonempty] = (distinct[low[nonempty]] + distinct[high[nonempty]]) / 2
+        return medians
+
+    def aggregate(self, by, statistics):
+        """Like df.groupby(by).agg(statistics) for a dict {measure: [statistic, ...]},
+        with (measure, statistic) columns; or df.groupby(by)[measure].agg(list) for a (measure, list) pair"""
+        by = [by] if isinstance(by, str) else list(by)
+        flat = isinstance(statistics, tuple)
+        statistics = dict([statistics]) if flat else statistics
+        group, index = self._groups(by)
+        columns = {}
+        for measure, names in statistics.items():
+            if measure not in self.cells:
+                continue
+            names = [names] if isinstance(names, str) else names
+            rolled = self._rollup(measure, group, len(index))
+            for name in names:
+                value = self._median(measure, by, group, len(index)) if name == 'median' else rolled[name]
+                if name != 'count':
+                    value = value.astype(self.result_dtypes[measure])
+                columns[name if flat else (measure, name)] = value
+        table = pd.DataFrame(columns, index=index)
+        if not flat and len(table.columns):
+            table.columns = pd.MultiIndex.from_tuples(table.columns)
+        return table
+
+    def anova(self, by, measure):
+        """One-way ANOVA of `measure` across the groups of `by`: (F statistic, degrees of freedom between, within)"""
+        group, index = self._groups([by])
+        rolled = self._rollup(measure, group, len(index))
+        count, mean = rolled['count'], rolled['mean']
+        nonempty = count > 0
+        total = count[nonempty].sum()
+        grand_mean = (mean[nonempty] * count[nonempty]).sum() / total
+        between = (count[nonempty] * (mean[nonempty] - grand_mean) ** 2).sum()
+        within = rolled['m2'][nonempty].sum()
+        df_between, df_within = int(nonempty.sum()) - 1, int(total) - int(nonempty.sum())
+        return (between / df_between) / (within / df_within), df_between, df_within
+
+    def counts(self, by):
+        """Number of rows in each group of `by` (rows missing any of its dimensions are left out)"""
+        by = [by] if isinstance(by, str) else list(by)
+        group, index = self._groups(by)
+        included = group >= 0
+        return pd.Series(np.bincount(group[included], weights=self.cell_rows[included],
+                                     minlength=len(index)).astype(np.int64), index=index, name='count')
+
+    def crosstab(self, rows, columns, normalize=False):
+        """Like pd.crosstab(df[rows], df[columns], normalize=normalize) for normalize False, 'index' or 'columns'"""
+        table = self.counts([rows, columns]).unstack(fill_value=0)
+        table.columns.name = columns
+        if normalize == 'index':
+            return table.div(table.sum(axis=1), axis=0)
+        if normalize == 'columns':
+            return table.div(table.sum(axis=0), axis=1)
+        return table
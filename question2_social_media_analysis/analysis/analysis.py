@@ -3,6 +3,8 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import argparse
 from scipy import stats
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split
@@ -11,35 +13,65 @@ from sklearn.metrics import mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
-def perform_comparative_analysis(df):
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+from storage import load_table  # noqa: E402
+from aggregation import AggregationCube  # noqa: E402
+from recommendation import RecommendationIndex  # noqa: E402
+
+DEFAULT_INPUT_PATH = os.path.join(CURRENT_DIR, '..', 'data_processing', 'cleaned_products.csv')
+# The only cleaned columns the analyses use; columnar inputs skip the rest
+ANALYSIS_COLUMNS = ['source', 'title', 'price', 'rating', 'category', 'availability_standardized',
+                    'sentiment_score', 'duplicate_cluster']
+# Numeric identifiers, which are not measurements and stay out of the correlations
+IDENTIFIER_COLUMNS = ['duplicate_cluster']
+# What the grouped reports break down, and by what; one AggregationCube serves them all
+REPORT_DIMENSIONS = ['source', 'category', 'availability_standardized']
+REPORT_MEASURES = ['price', 'rating']
+
+def build_cube(df):
+    """The grouped statistics of every report, from one scan of the data"""
+    return AggregationCube(df, REPORT_DIMENSIONS, REPORT_MEASURES)
+
+def perform_comparative_analysis(df, cube=None):
     """Comparative analysis between different data sources"""
     print("\n=== COMPARATIVE ANALYSIS BETWEEN SOURCES ===")
     
     if 'source' not in df.columns:
         print("No source information available for comparative analysis")
         return
+    cube = cube or build_cube(df)
     
     # Price comparison by source
-    source_price_stats = df.groupby('source')['price'].agg([
+    source_price_stats = cube.aggregate('source', ('price', [
         'count', 'mean', 'median', 'std', 'min', 'max'
-    ]).round(2)
+    ])).round(2)
     print("\nPrice Statistics by Source:")
     print(source_price_stats)
     
     # Rating comparison by source
     if 'rating' in df.columns:
-        source_rating_stats = df.groupby('source')['rating'].agg([
+        source_rating_stats = cube.aggregate('source', ('rating', [
             'mean', 'median', 'std', 'count'
-        ]).round(2)
+        ])).round(2)
         print("\nRating Statistics by Source:")
         print(source_rating_stats)
     
     # Category distribution by source
     if 'category' in df.columns:
-        category_cross = pd.crosstab(df['source'], df['category'], normalize='index') * 100
+        category_cross = cube.crosstab('source', 'category', normalize='index') * 100
         print("\nCategory Distribution by Source (%):")
         print(category_cross.round(2))
 
+    # Clusters added by data_processing/near_duplicates.py
+    if 'duplicate_cluster' in df.columns:
+        cluster_sources = df.groupby('duplicate_cluster')['source'].nunique()
+        cluster_sizes = df['duplicate_cluster'].value_counts()
+        print(f"\nNear-duplicate products: {int((cluster_sizes > 1).sum())} groups covering "
+              f"{int(cluster_sizes[cluster_sizes > 1].sum())} records, "
+              f"{int((cluster_sources > 1).sum())} listed by more than one source")
+
 def perform_hypothesis_testing(df):
     """Advanced hypothesis testing"""
     print("\n=== HYPOTHESIS TESTING ===")
@@ -98,21 +130,28 @@ def perform_advanced_statistical_analysis(df):
         print("\nTop 5 price outliers (IQR method):")
         print(iqr_outliers[['title', 'price', 'source', 'category']].sort_values('price', ascending=False).head())
 
-def perform_analysis():
-    """
-    Performs comprehensive statistical analysis on the cleaned product data.
-    """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    input_file_path = os.path.join(current_dir, '..', 'data_processing', 'cleaned_products.csv')
-
+def load_cleaned_data(input_file_path=DEFAULT_INPUT_PATH, report_memory=False):
+    """The columns the analyses use, or None if the file is missing"""
     print(f"Reading cleaned data from {input_file_path}...")
 
     try:
-        df = pd.read_csv(input_file_path)
+        return load_table(input_file_path, columns=ANALYSIS_COLUMNS, report=report_memory)
     except FileNotFoundError:
         print(f"Error: The file '{input_file_path}' was not found.")
         return None
 
+def perform_analysis(input_file_path=DEFAULT_INPUT_PATH, report_memory=False):
+    """
+    Performs comprehensive statistical analysis on the cleaned product data.
+    """
+    df = load_cleaned_data(input_file_path, report_memory)
+    if df is not None:
+        describe_data(df)
+    return df
+
+def describe_data(df, cube=None):
+    """Descriptive, grouped, correlation and statistical analyses of cleaned data in memory"""
+    cube = cube or build_cube(df)
     print(f"Dataset shape: {df.shape}")
 
     # --- Basic Descriptive Statistics ---
@@ -136,25 +175,23 @@ def perform_analysis():
     # --- Grouped Analysis ---
     if 'category' in df.columns:
         print("\n=== PRICE AND RATING ANALYSIS BY CATEGORY ===")
-        category_stats = df.groupby('category').agg({
+        category_stats = cube.aggregate('category', {
             'price': ['count', 'mean', 'median', 'std', 'min', 'max'],
             'rating': ['mean', 'median', 'std'] if 'rating' in df.columns else []
         }).round(2)
         print(category_stats)
 
     # --- Correlation Analysis ---
-    numerical_columns = df.select_dtypes(include=[np.number]).columns
+    numerical_columns = df.select_dtypes(include=[np.number]).columns.drop(IDENTIFIER_COLUMNS, errors='ignore')
     if len(numerical_columns) > 1:
         print("\n=== CORRELATION MATRIX ===")
         correlation_matrix = df[numerical_columns].corr()
         print(correlation_matrix)
 
     # --- Advanced Analyses ---
-    perform_comparative_analysis(df)
+    perform_comparative_analysis(df, cube)
     perform_hypothesis_testing(df)
     perform_advanced_statistical_analysis(df)
-    
-    return df
 
 def perform_predictive_analysis(df):
     """
@@ -231,30 +268,19 @@ def create_recommendation_system(df):
         print("Insufficient data for recommendation system")
         return
     
-    # Simple content-based filtering
-    def recommend_similar_products(product_title, n_recommendations=5):
-        product = df[df['title'] == product_title].iloc[0]
-        same_category = df[df['category'] == product['category']]
-        similar_products = same_category[same_category['title'] != product_title]
-        
-        # Sort by rating and price similarity
-        similar_products = similar_products.sort_values(
-            by=['rating', 'price'], 
-            ascending=[False, True]
-        )
-        
-        return similar_products.head(n_recommendations)
+    # Simple content-based filtering: the best rated, then cheapest, products of the same category
+    index = RecommendationIndex(df)
     
     # Test the recommendation system
     if len(df) > 0:
         sample_product = df.iloc[0]['title']
-        recommendations = recommend_similar_products(sample_product, 3)
+        recommendations = index.recommend(sample_product, 3)
         
         print(f"Recommendations similar to '{sample_product}':")
         for idx, row in recommendations.iterrows():
             print(f"  - {row['title']} (Rating: {row['rating']}, Price: ${row['price']:.2f})")
 
-def analyze_availability_pricing_relationship(df):
+def analyze_availability_pricing_relationship(df, cube=None):
     """
     Analyze relationship between availability and pricing
     """
@@ -263,8 +289,9 @@ def analyze_availability_pricing_relationship(df):
     if 'availability_standardized' not in df.columns:
         print("Availability data not available for analysis")
         return
+    cube = cube or build_cube(df)
     
-    availability_stats = df.groupby('availability_standardized').agg({
+    availability_stats = cube.aggregate('availability_standardized', {
         'price': ['mean', 'median', 'count'],
         'rating': 'mean' if 'rating' in df.columns else []
     }).round(2)
@@ -273,15 +300,27 @@ def analyze_availability_pricing_relationship(df):
     print(availability_stats)
     
     # Statistical test for price differences by availability
-    availability_groups = [group for name, group in df.groupby('availability_standardized')]
-    if len(availability_groups) >= 2:
-        f_stat, p_value = stats.f_oneway(*[group['price'].dropna() for group in availability_groups])
+    # One-way ANOVA from the per-group counts, means and squared deviations, as stats.f_oneway computes it
+    if len(cube.counts('availability_standardized')) >= 2:
+        f_stat, df_between, df_within = cube.anova('availability_standardized', 'price')
+        p_value = stats.f.sf(f_stat, df_between, df_within)
         print(f"\nANOVA test for price differences by availability:")
         print(f"F-statistic: {f_stat:.3f}, P-value: {p_value:.3f}")
 
+def run_analyses(df):
+    """Every analysis, in the order the command line runs them, sharing one AggregationCube"""
+    cube = build_cube(df)
+    describe_data(df, cube)
+    perform_predictive_analysis(df)
+    create_recommendation_system(df)
+    analyze_availability_pricing_relationship(df, cube)
+
 if __name__ == "__main__":
-    cleaned_df = perform_analysis()
+    parser = argparse.ArgumentParser(description="Analyse the cleaned product data")
+    parser.add_argument('--input', metavar='PATH', default=DEFAULT_INPUT_PATH,
+                        help="cleaned data: .csv or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--memory-report', action='store_true', help="print memory use per column after loading")
+    args = parser.parse_args()
+    cleaned_df = load_cleaned_data(args.input, args.memory_report)
     if cleaned_df is not None:
-        perform_predictive_analysis(cleaned_df)
-        create_recommendation_system(cleaned_df)
-        analyze_availability_pricing_relationship(cleaned_df)
\ No newline at end of file
+        run_analyses(cleaned_df)
\ No newline at end of file
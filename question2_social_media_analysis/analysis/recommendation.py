@@ -0,0 +1,112 @@
+# question2_social_media_analysis/analysis/recommendation.py
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+from storage import load_table  # noqa: E402
+
+DEFAULT_INPUT_PATH = os.path.join(CURRENT_DIR, '..', 'data_processing', 'cleaned_products.csv')
+RECOMMENDATION_COLUMNS = ['title', 'category', 'rating', 'price']
+DEFAULT_RECOMMENDATIONS = 5
+
+class RecommendationIndex:
+    """Top-rated products of the same category as a given one, from a prebuilt ranking
+
+    Rows are sorted once by category, then rating (highest first) and
+    price (lowest first), missing values last and ties in row order, as
+    DataFrame.sort_values ranks them, so each category is one run of that
+    order already ranked. Titles are factorized for the lookup of a
+    product's row. A query reads the head of its category's run, skipping
+    rows with the queried title, so it costs O(k + copies of the title)
+    whatever the size of the data; batches gather every query's run at once.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        title_codes, titles = pd.factorize(df['title'])
+        self.title_codes = title_codes
+        # Row of the first product with each title, and how many products share it
+        self.title_rows = pd.Series(np.arange(len(df))).groupby(title_codes).first().reindex(
+            range(len(titles))).to_numpy()
+        self.title_counts = np.bincount(title_codes[title_codes >= 0], minlength=len(titles))
+        # Object dtype, so lookups reuse the index's hash table rather than converting arrow strings each time
+        self.title_lookup = pd.Index(np.asarray(titles, dtype=object))
+
+        category_codes, categories = pd.factorize(df['category'])
+        rating = df['rating'].to_numpy(dtype=float, na_value=np.nan)
+        price = df['price'].to_numpy(dtype=float, na_value=np.nan)
+        # np.lexsort is stable and sorts NaN last; its last key is the primary one
+        self.order = np.lexsort((price, -rating, category_codes))
+        sorted_categories = category_codes[self.order]
+        self.category_codes = category_codes
+        self.starts = np.searchsorted(sorted_categories, np.arange(len(categories)), side='left')
+        self.ends = np.searchsorted(sorted_categories, np.arange(len(categories)), side='right')
+
+    def product_rows(self, titles):
+        """Row position of the first product with each title, -1 where there is none"""
+        codes = self.title_lookup.get_indexer(pd.Index(np.asarray(titles, dtype=object)))
+        return np.where(codes >= 0, self.title_rows[np.maximum(codes, 0)], -1)
+
+    def _recommended_rows(self, rows, n_recommendations):
+        """Positions of up to `n_recommendations` products for each query row, as a (queries, n) array
+        padded with -1"""
+        categories = self.category_codes[rows]
+        titles = self.title_codes[rows]
+        # A category's run holds at most title_counts copies of the query's title to skip
+        width = n_recommendations + int(self.title_counts[titles].max(initial=0))
+        starts = np.where(categories >= 0, self.starts[np.maximum(categories, 0)], 0)
+        ends = np.where(categories >= 0, self.ends[np.maximum(categories, 0)], 0)
+        positions = starts[:, None] + np.arange(width)
+        inside = positions < ends[:, None]
+        candidates = self.order[np.minimum(positions, len(self.order) - 1)]
+        keep = inside & (self.title_codes[candidates] != titles[:, None])
+        keep &= np.cumsum(keep, axis=1) <= n_recommendations
+
+        recommended = np.full((len(rows), n_recommendations), -1)
+        query, slot = np.nonzero(keep)
+        recommended[query, np.cumsum(keep, axis=1)[query, slot] - 1] = candidates[query, slot]
+        return recommended
+
+    def recommend(self, product_title, n_recommendations=DEFAULT_RECOMMENDATIONS):
+        """The best rated, then cheapest, other products of the product's category"""
+        rows = self.product_rows([product_title])
+        if rows[0] < 0:
+            raise KeyError(f"No product titled {product_title!r}")
+        recommended = self._recommended_rows(rows, n_recommendations)[0]
+        return self.df.iloc[recommended[recommended >= 0]]
+
+    def recommend_batch(self, product_titles, n_recommendations=DEFAULT_RECOMMENDATIONS):
+        """Recommendations for many products at once, one row per recommendation with the
+        query_title and its rank; titles without a product are left out"""
+        product_titles = pd.Series(product_titles, dtype=object).reset_index(drop=True)
+        rows = self.product_rows(product_titles)
+        found = np.flatnonzero(rows >= 0)
+        recommended = self._recommended_rows(rows[found], n_recommendations)
+        query, rank = np.nonzero(recommended >= 0)
+        result = self.df.iloc[recommended[query, rank]].copy()
+        result.insert(0, 'query_title', product_titles.to_numpy()[found[query]])
+        result.insert(1, 'rank', rank + 1)
+        return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommend products of the same category as the given ones")
+    parser.add_argument('--input', metavar='PATH', default=DEFAULT_INPUT_PATH,
+                        help="cleaned data: .csv or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--title', action='append', required=True, help="product title to recommend for (repeatable)")
+    parser.add_argument('-n', type=int, default=DEFAULT_RECOMMENDATIONS, help="recommendations per product")
+    args = parser.parse_args()
+    df = load_table(args.input, columns=RECOMMENDATION_COLUMNS)
+    index = RecommendationIndex(df)
+    for title in args.title:
+        if index.product_rows([title])[0] < 0:
+            print(f"No product titled '{title}'")
+    for title, recommendations in index.recommend_batch(args.title, args.n).groupby('query_title', sort=False):
+        print(f"Recommendations similar to '{title}':")
+        for _, row in recommendations.iterrows():
+            print(f"  - {row['title']} (Rating: {row['rating']}, Price: ${row['price']:.2f})")
@@ -0,0 +1,58 @@
+# question2_social_media_analysis/benchmarks/bench_aggregation.py
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'analysis'))
+
+from storage import load_table  # noqa: E402
+from analysis import ANALYSIS_COLUMNS, REPORT_DIMENSIONS, REPORT_MEASURES  # noqa: E402
+from aggregation import AggregationCube  # noqa: E402
+from bench_loading import make_cleaned  # noqa: E402
+
+STATISTICS = {'price': ['count', 'mean', 'median', 'std', 'min', 'max'], 'rating': ['mean', 'median', 'std']}
+# The reports' breakdowns first, then ones a growing report might add
+BREAKDOWNS = [['source'], ['category'], ['availability_standardized'], ['source', 'category'],
+              ['category', 'availability_standardized'], ['source', 'availability_standardized'],
+              ['source', 'category', 'availability_standardized']]
+
+def groupby_seconds(df, breakdowns):
+    start = time.perf_counter()
+    for by in breakdowns:
+        df.groupby(by, observed=True).agg(STATISTICS)
+    return time.perf_counter() - start
+
+def cube_seconds(df, breakdowns):
+    start = time.perf_counter()
+    cube = AggregationCube(df, REPORT_DIMENSIONS, REPORT_MEASURES)
+    for by in breakdowns:
+        cube.aggregate(by, STATISTICS)
+    return time.perf_counter() - start
+
+def run_benchmark(rows=1_000_000, repeat=3):
+    """Time of every statistic for the first k breakdowns: one groupby each vs one AggregationCube"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cleaned.csv')
+        make_cleaned(rows, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = load_table(path, columns=ANALYSIS_COLUMNS)
+
+    print(f"{rows} rows")
+    print(f"{'breakdowns':>10}{'groupby s':>11}{'cube s':>8}{'speedup':>9}")
+    results = []
+    for count in range(1, len(BREAKDOWNS) + 1):
+        breakdowns = BREAKDOWNS[:count]
+        grouped = min(groupby_seconds(df, breakdowns) for _ in range(repeat))
+        cubed = min(cube_seconds(df, breakdowns) for _ in range(repeat))
+        results.append({'breakdowns': count, 'groupby': grouped, 'cube': cubed})
+        print(f"{count:>10}{grouped:>11.3f}{cubed:>8.3f}{grouped / cubed:>8.1f}x")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,50 @@
+# question2_social_media_analysis/benchmarks/bench_chunked.py
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_processing'))
+
+import data_cleaner  # noqa: E402
+
+SCRAPED_CSV = os.path.join(CURRENT_DIR, '..', 'data_collection', 'scraped_products.csv')
+
+def make_history(rows, appends, path):
+    """Writes `rows` scraped records followed by `appends` more copies of them, as when the same
+    scrape is appended to the history again; every chunk after the first `rows` repeats earlier ones"""
+    df = pd.read_csv(SCRAPED_CSV).sample(rows, replace=True, random_state=0).reset_index(drop=True)
+    df['title'] = df['title'] + ' #' + df.index.astype(str)
+    pd.concat([df] * (appends + 1), ignore_index=True).to_csv(path, index=False)
+
+def run_benchmark(rows=20_000, appends=2, chunksizes=(1_000, 5_000, 20_000)):
+    """Times clean_data and clean_data_chunked on a history whose later chunks repeat earlier ones"""
+    print(f"{'chunksize':>10}{'seconds':>9}{'records':>9}")
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'history.csv')
+        make_history(rows, appends, input_path)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            records = len(data_cleaner.clean_data(input_path, os.path.join(directory, 'full.csv'), None))
+        seconds = time.perf_counter() - start
+        results.append({'chunksize': None, 'seconds': seconds, 'records': records})
+        print(f"{'full':>10}{seconds:>9.2f}{records:>9}")
+
+        for chunksize in chunksizes:
+            output_path = os.path.join(directory, f'chunked_{chunksize}.csv')
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                records = data_cleaner.clean_data_chunked(input_path, output_path, chunksize, None)
+            seconds = time.perf_counter() - start
+            results.append({'chunksize': chunksize, 'seconds': seconds, 'records': records})
+            print(f"{chunksize:>10}{seconds:>9.2f}{records:>9}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
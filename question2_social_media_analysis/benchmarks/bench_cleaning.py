@@ -0,0 +1,56 @@
+# question2_social_media_analysis/benchmarks/bench_cleaning.py
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_processing'))
+
+import data_cleaner  # noqa: E402
+from fixture_site import load_catalogue, DESCRIPTION  # noqa: E402
+
+# Text that exercises every rule: punctuation, symbols, unicode, tabs and newlines
+EXTRA_TEXT = [
+    "  Save 20%!!  Free #shipping @store\t— limited   time\n",
+    "Café déjà vu: naïve résumé (2nd ed.), £12.99",
+    "Ünïcödé ÀÉÎÕÜ 東京 ☃ emoji 🎉 and_underscores",
+    "",
+    None,
+]
+
+def make_texts(rows, unique):
+    """Titles and descriptions as scraped; with `unique`, every row is made distinct"""
+    titles = [book['title'] for book in load_catalogue()]
+    pool = titles + [DESCRIPTION] + EXTRA_TEXT
+    rng = np.random.default_rng(0)
+    texts = pd.Series([pool[i] for i in rng.integers(0, len(pool), rows)], dtype=object)
+    if unique:
+        texts = texts.fillna('') + pd.Series([f" #{i} @user{i}!" for i in range(rows)])
+    return texts
+
+def rows_per_second(clean, texts):
+    start = time.perf_counter()
+    result = clean(texts)
+    return result, len(texts) / (time.perf_counter() - start)
+
+def run_benchmark(sizes=(10_000, 100_000, 1_000_000)):
+    """Compares row-by-row clean_text with the vectorized clean_text_series"""
+    print(f"{'rows':>10}{'texts':>9}{'apply rows/s':>15}{'vectorized rows/s':>20}{'speedup':>10}")
+    results = []
+    for rows in sizes:
+        for unique in (False, True):
+            texts = make_texts(rows, unique)
+            expected, apply_rate = rows_per_second(lambda t: t.apply(data_cleaner.clean_text), texts)
+            actual, vector_rate = rows_per_second(data_cleaner.clean_text_series, texts)
+            if list(expected) != list(actual):
+                raise AssertionError(f"clean_text_series differs from clean_text on {rows} rows")
+            label = 'unique' if unique else 'repeated'
+            results.append({'rows': rows, 'texts': label, 'apply': apply_rate, 'vectorized': vector_rate})
+            print(f"{rows:>10}{label:>9}{apply_rate:>15.0f}{vector_rate:>20.0f}{vector_rate / apply_rate:>9.1f}x")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
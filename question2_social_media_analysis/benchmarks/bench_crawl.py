@@ -0,0 +1,130 @@
+# question2_social_media_analysis/benchmarks/bench_crawl.py
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+import scraper  # noqa: E402
+from http_client import configure_session  # noqa: E402
+from throttle import AdaptiveThrottle, RetryPolicy  # noqa: E402
+from fixture_server import start_server  # noqa: E402
+
+# Throughput may drop, and memory grow, by this fraction before --baseline flags a regression
+DEFAULT_TOLERANCE = 0.2
+
+def _all_sources(urls, max_rate, output_dir, **options):
+    limits = {name: {'requests_per_second': max_rate or None, 'timeout': 10, 'deadline': None}
+              for name in scraper.SOURCE_LIMITS}
+    counts = scraper.scrape_all_sources(output_path=os.path.join(output_dir, 'products.csv'),
+                                        source_urls=urls, source_limits=limits, **options)
+    return sum(counts.values())
+
+def _books(mode, urls, **options):
+    return sum(1 for _ in scraper.BOOKS_SCRAPERS[mode](urls['books_toscrape'], **options))
+
+# name -> function(urls, max_rate, output_dir) returning the number of records scraped
+SCENARIOS = {
+    'all_sources': lambda urls, max_rate, output_dir: _all_sources(urls, max_rate, output_dir),
+    'all_sources_parallel': lambda urls, max_rate, output_dir: _all_sources(
+        urls, max_rate, output_dir, books_mode='category', parallel=True),
+    'books_sequential': lambda urls, max_rate, output_dir: _books('sequential', urls),
+    'books_async': lambda urls, max_rate, output_dir: _books('async', urls, max_concurrency=16),
+    'books_category': lambda urls, max_rate, output_dir: _books('category', urls),
+}
+
+def _peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_scenario(name, urls, max_rate):
+    """Runs one scenario in this (fresh) process and returns records, seconds and peak memory"""
+    throttle = AdaptiveThrottle(initial_rate=max_rate, max_rate=max_rate) if max_rate else None
+    configure_session(throttle=throttle, retry=RetryPolicy())
+    rss_before = _peak_rss_mb()
+    with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        records = SCENARIOS[name](urls, max_rate, output_dir)
+        seconds = time.perf_counter() - start
+    return {'records': records, 'seconds': seconds,
+            'peak_rss_mb': _peak_rss_mb(), 'rss_growth_mb': _peak_rss_mb() - rss_before}
+
+def run_benchmark(scenarios=None, size=1000, latency=0.005, rss_items=500, max_rate=0):
+    """Replays each scenario against a local fixture server and reports its throughput and memory"""
+    server = start_server(size, rss_items=rss_items, latency=latency)
+    results = {}
+    print(f"{size} books, {rss_items} feed items, {latency * 1000:.0f} ms latency, "
+          f"{'unthrottled' if not max_rate else f'{max_rate} req/s per host'}")
+    print(f"{'scenario':<22}{'records':>9}{'seconds':>9}{'records/s':>11}{'requests/s':>12}{'peak MB':>9}{'growth MB':>11}")
+    try:
+        for name in scenarios or SCENARIOS:
+            requests_before = server.stats['requests']
+            # Each scenario gets a fresh interpreter so its peak memory is its own
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                result = pool.submit(run_scenario, name, server.source_urls, max_rate).result()
+            result['requests'] = server.stats['requests'] - requests_before
+            result['records_per_second'] = result['records'] / result['seconds']
+            result['requests_per_second'] = result['requests'] / result['seconds']
+            results[name] = result
+            print(f"{name:<22}{result['records']:>9}{result['seconds']:>9.2f}{result['records_per_second']:>11.1f}"
+                  f"{result['requests_per_second']:>12.1f}{result['peak_rss_mb']:>9.1f}{result['rss_growth_mb']:>11.1f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Lists scenarios that are slower or use more memory than `baseline` by more than `tolerance`"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result['records'] != before['records']:
+            regressions.append(f"{name}: {result['records']} records, baseline had {before['records']}")
+        if result['records_per_second'] < before['records_per_second'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['records_per_second']:.1f} records/s, "
+                               f"baseline {before['records_per_second']:.1f}")
+        if result['peak_rss_mb'] > before['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(f"{name}: peak {result['peak_rss_mb']:.1f} MB, baseline {before['peak_rss_mb']:.1f} MB")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against local fixture sites")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--size', type=int, default=1000, help="number of books in the fixture catalogue")
+    parser.add_argument('--latency', type=float, default=0.005, help="seconds the server waits before each response")
+    parser.add_argument('--rss-items', type=int, default=500, help="number of items in the deals feed")
+    parser.add_argument('--max-rate', type=float, default=0,
+                        help="requests per second per host for the scrapers (0 = unthrottled)")
+    parser.add_argument('--output', metavar='PATH', help="write the results as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="fail if results regress against this JSON file")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed fractional slowdown or memory growth against the baseline")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = run_benchmark(args.scenarios, args.size, args.latency, args.rss_items, args.max_rate)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
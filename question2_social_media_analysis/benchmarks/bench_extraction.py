@@ -0,0 +1,89 @@
+# question2_social_media_analysis/benchmarks/bench_extraction.py
+
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+import extractors  # noqa: E402
+
+FIXTURES_DIR = os.path.join(CURRENT_DIR, 'fixtures')
+PAGE_URL = "http://books.toscrape.com/catalogue/page-1.html"
+
+# --- Baseline: the original full-tree html.parser extraction ---
+
+def baseline_listing(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    books = []
+    for book in soup.find_all('article', class_='product_pod'):
+        price = book.find('p', class_='price_color').text
+        books.append((book.h3.a['title'], float(price[1:]), book.find('p', class_='star-rating')['class'][1]))
+    return books
+
+def baseline_detail(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    category = soup.find('ul', class_='breadcrumb').find_all('li')[2].text.strip()
+    availability = soup.find('p', class_='instock').text.strip()
+    return category, availability
+
+def baseline_demo(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    products = []
+    for card in soup.find_all('div', class_='card-body'):
+        title = card.find('a', class_='title')['title']
+        price = float(card.find('h4', class_='price').text.replace('$', '').replace(',', ''))
+        rating_element = card.find('div', class_='ratings')
+        rating = len(rating_element.find_all('span', class_='glyphicon-star')) if rating_element else 0
+        products.append((title, price, rating))
+    return products
+
+# --- Fast path: targeted parsing through data_collection/extractors.py ---
+
+def fast_listing(content):
+    return [(book['title'], book['price'], book['rating'])
+            for book in extractors.parse_book_listing(extractors.parse_page(content), PAGE_URL)]
+
+def fast_detail(content):
+    return extractors.parse_book_detail(extractors.parse_page(content))
+
+def fast_demo(content):
+    return [(product['title'], product['price'], product['rating'])
+            for product in extractors.parse_demo_products(extractors.parse_page(content))]
+
+CASES = [
+    ('books listing', 'books_listing.html', baseline_listing, fast_listing),
+    ('books detail', 'books_detail.html', baseline_detail, fast_detail),
+    ('demo products', 'demo_products.html', baseline_demo, fast_demo),
+]
+
+def pages_per_second(extract, content, min_seconds):
+    """Runs `extract` repeatedly for at least `min_seconds` and returns its rate"""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        extract(content)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return runs / elapsed
+
+def run_benchmark(min_seconds=1.0):
+    """Compares pages/sec of the baseline and fast extraction on each fixture page"""
+    print(f"{'page':<16}{'baseline p/s':>14}{'fast p/s':>12}{'speedup':>10}")
+    results = {}
+    for name, filename, baseline, fast in CASES:
+        with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+            content = f.read()
+        if baseline(content) != fast(content):
+            raise AssertionError(f"Fast extraction differs from baseline on {filename}")
+        slow_rate = pages_per_second(baseline, content, min_seconds)
+        fast_rate = pages_per_second(fast, content, min_seconds)
+        results[name] = {'baseline': slow_rate, 'fast': fast_rate, 'speedup': fast_rate / slow_rate}
+        print(f"{name:<16}{slow_rate:>14.1f}{fast_rate:>12.1f}{fast_rate / slow_rate:>9.1f}x")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,62 @@
+# question2_social_media_analysis/benchmarks/bench_loading.py
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'analysis'))
+
+from storage import read_table, load_table  # noqa: E402
+from analysis import ANALYSIS_COLUMNS  # noqa: E402
+
+CLEANED_CSV = os.path.join(CURRENT_DIR, '..', 'data_processing', 'cleaned_products.csv')
+
+def make_cleaned(rows, path):
+    """Writes `rows` cleaned records, resampled from the committed cleaned output"""
+    df = pd.read_csv(CLEANED_CSV).sample(rows, replace=True, random_state=0).reset_index(drop=True)
+    df['title'] = df['title'] + ' #' + df.index.astype(str)
+    df.to_csv(path, index=False)
+
+def groupby_seconds(df, repeat=5):
+    """Time of the grouped aggregations analysis.py runs, best of `repeat`"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df.groupby('category', observed=True).agg({'price': ['count', 'mean', 'median', 'std', 'min', 'max'],
+                                                   'rating': ['mean', 'median', 'std']})
+        df.groupby('source', observed=True)['price'].agg(['count', 'mean', 'median', 'std', 'min', 'max'])
+        df.groupby('availability_standardized', observed=True).agg({'price': ['mean', 'median', 'count'],
+                                                                    'rating': 'mean'})
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmark(sizes=(100_000, 1_000_000)):
+    """Compares default read_table dtypes with load_table's categorical and downcast dtypes"""
+    print(f"{'rows':>10}{'default MB':>12}{'loaded MB':>11}{'shrink':>8}{'default groupby s':>19}"
+          f"{'loaded groupby s':>18}{'speedup':>9}")
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            path = os.path.join(directory, f'cleaned_{rows}.csv')
+            make_cleaned(rows, path)
+            default = read_table(path, columns=ANALYSIS_COLUMNS)
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded = load_table(path, columns=ANALYSIS_COLUMNS)
+            default_mb = default.memory_usage(deep=True).sum() / 2 ** 20
+            loaded_mb = loaded.memory_usage(deep=True).sum() / 2 ** 20
+            default_seconds = groupby_seconds(default)
+            loaded_seconds = groupby_seconds(loaded)
+            results.append({'rows': rows, 'default_mb': default_mb, 'loaded_mb': loaded_mb,
+                            'default_groupby': default_seconds, 'loaded_groupby': loaded_seconds})
+            print(f"{rows:>10}{default_mb:>12.1f}{loaded_mb:>11.1f}{default_mb / loaded_mb:>7.1f}x"
+                  f"{default_seconds:>19.3f}{loaded_seconds:>18.3f}{default_seconds / loaded_seconds:>8.1f}x")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,61 @@
+# question2_social_media_analysis/benchmarks/bench_recommendation.py
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'analysis'))
+
+from storage import load_table  # noqa: E402
+from recommendation import RecommendationIndex, RECOMMENDATION_COLUMNS  # noqa: E402
+from bench_loading import make_cleaned  # noqa: E402
+
+def recommend_by_filtering(df, product_title, n_recommendations):
+    """The recommendations as analysis.py used to compute them, filtering and sorting per query"""
+    product = df[df['title'] == product_title].iloc[0]
+    same_category = df[df['category'] == product['category']]
+    similar_products = same_category[same_category['title'] != product_title]
+    similar_products = similar_products.sort_values(by=['rating', 'price'], ascending=[False, True])
+    return similar_products.head(n_recommendations)
+
+def run_benchmark(sizes=(100_000, 1_000_000), queries=2_000, filtered_queries=20, n_recommendations=5):
+    """Per-query time of filtering and sorting vs a RecommendationIndex, singly and in one batch"""
+    print(f"{'rows':>10}{'filter ms/query':>17}{'build s':>9}{'index ms/query':>16}{'batch ms/query':>16}")
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            path = os.path.join(directory, f'cleaned_{rows}.csv')
+            make_cleaned(rows, path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = load_table(path, columns=RECOMMENDATION_COLUMNS)
+            titles = df['title'].sample(queries, random_state=0).tolist()
+
+            start = time.perf_counter()
+            for title in titles[:filtered_queries]:
+                recommend_by_filtering(df, title, n_recommendations)
+            filtered = (time.perf_counter() - start) / filtered_queries
+
+            start = time.perf_counter()
+            index = RecommendationIndex(df)
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for title in titles:
+                index.recommend(title, n_recommendations)
+            single = (time.perf_counter() - start) / queries
+
+            start = time.perf_counter()
+            index.recommend_batch(titles, n_recommendations)
+            batch = (time.perf_counter() - start) / queries
+
+            results.append({'rows': rows, 'filter': filtered, 'build': build, 'index': single, 'batch': batch})
+            print(f"{rows:>10}{filtered * 1000:>17.2f}{build:>9.3f}{single * 1000:>16.3f}{batch * 1000:>16.4f}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,59 @@
+# question2_social_media_analysis/benchmarks/bench_resilience.py
+
+import os
+import sys
+import time
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+import scraper  # noqa: E402
+from http_client import create_session  # noqa: E402
+from telemetry import CrawlTelemetry, instrument  # noqa: E402
+from throttle import AdaptiveThrottle, RetryPolicy  # noqa: E402
+from fixture_server import start_server  # noqa: E402
+
+CATALOGUE_SIZE = 200
+FAULT_RATES = [0.0, 0.05, 0.2]
+
+def make_session(resilient):
+    """A plain session, or one with the adaptive throttle and retries scaled for a local server"""
+    if not resilient:
+        return create_session()
+    return create_session(throttle=AdaptiveThrottle(initial_rate=20, max_rate=500, increase=5),
+                          retry=RetryPolicy(max_retries=4, base_delay=0.05, max_delay=1.0))
+
+def crawl(server, resilient):
+    telemetry = CrawlTelemetry()
+    session = make_session(resilient)
+    start = time.perf_counter()
+    records = list(scraper.iter_books_toscrape(server.url, session=instrument(session, telemetry, 'books')))
+    elapsed = time.perf_counter() - start
+    stats = telemetry.summary()['sources']['books']
+    rate = session.throttle.summary() if session.throttle is not None else {}
+    session.close()
+    return {'records': len(records), 'seconds': elapsed, 'requests': stats['requests'],
+            'retries': stats['retries'], 'final_rate': next(iter(rate.values()), None)}
+
+def run_benchmark(size=CATALOGUE_SIZE, fault_rates=FAULT_RATES):
+    """Crawls the fixture site with injected 429/503s and dropped connections, with and without retries"""
+    print(f"{'faults':>7}{'session':>11}{'records':>9}{'requests':>10}{'retries':>9}{'seconds':>9}{'rate':>8}")
+    results = []
+    for fault_rate in fault_rates:
+        for resilient in (False, True):
+            server = start_server(size, error_rate=fault_rate * 0.75, drop_rate=fault_rate * 0.25,
+                                  error_statuses=(429, 503), retry_after=0)
+            try:
+                result = crawl(server, resilient)
+            finally:
+                server.shutdown()
+                server.server_close()
+            result.update(fault_rate=fault_rate, resilient=resilient)
+            results.append(result)
+            print(f"{fault_rate:>7.0%}{'adaptive' if resilient else 'plain':>11}{result['records']:>6}/{size:<3}"
+                  f"{result['requests']:>9}{result['retries']:>9}{result['seconds']:>9.2f}"
+                  f"{result['final_rate'] or 0:>8.1f}")
+    return results
+
+if __name__ == "__main__":
+    run_benchmark()
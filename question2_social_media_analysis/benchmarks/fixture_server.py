@@ -0,0 +1,165 @@
+# question2_social_media_analysis/benchmarks/fixture_server.py
+
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fixture_site import (load_catalogue, category_index, render_listing, render_index, render_detail,
+                          render_demo_page, render_rss_feed)
+
+LISTING_PATH = re.compile(r'^/catalogue/page-(\d+)\.html$')
+CATEGORY_PATH = re.compile(r'^/catalogue/category/books/([^/]+)/(?:index|page-(\d+))\.html$')
+DETAIL_PATH = re.compile(r'^/catalogue/([^/]+)/index\.html$')
+DEMO_PATH = re.compile(r'^/test-sites/e-commerce/allinone/products/(\d+)$')
+FEED_PATH = '/feeds/deals.xml'
+
+# URLs of each source on a local server, in the form scraper.SOURCE_URLS uses
+DEMO_URL = 'test-sites/e-commerce/allinone/products/{}'
+FEED_URL = FEED_PATH.lstrip('/')
+
+class FixtureSite:
+    """Serves the fixture books.toscrape.com catalogue, demo shop and deals feed by URL path"""
+
+    def __init__(self, size=None, rss_items=50):
+        self.rss_items = rss_items
+        self.books = load_catalogue(size)
+        self.by_slug = {book['slug']: book for book in self.books}
+        self.categories = {slug: name for name, (_, slug) in category_index(self.books).items()}
+        self.pages = {}
+        self.lock = threading.Lock()
+
+    def _render(self, path):
+        if path in ('/', '/index.html'):
+            return render_index(self.books)
+        match = LISTING_PATH.match(path)
+        if match:
+            return render_listing(self.books, int(match.group(1)))
+        match = CATEGORY_PATH.match(path)
+        if match:
+            category = self.categories.get(match.group(1))
+            return render_listing(self.books, int(match.group(2) or 1), category) if category else None
+        match = DETAIL_PATH.match(path)
+        if match and match.group(1) in self.by_slug:
+            return render_detail(self.by_slug[match.group(1)], self.books)
+        match = DEMO_PATH.match(path)
+        if match:
+            return render_demo_page(int(match.group(1)))
+        return None
+
+    def page(self, path):
+        """Returns (content type, body bytes) for `path`, or None if there is no such page"""
+        with self.lock:
+            if path not in self.pages:
+                if path == FEED_PATH:
+                    self.pages[path] = ('application/rss+xml', render_rss_feed(self.rss_items).encode('utf-8'))
+                else:
+                    content = self._render(path)
+                    self.pages[path] = None if content is None else ('text/html; charset=utf-8',
+                                                                     content.encode('utf-8'))
+            return self.pages[path]
+
+class FaultInjectingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Small responses on keep-alive connections otherwise wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='text/plain', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        fault = server.choose_fault()
+        if server.latency:
+            time.sleep(server.latency)
+
+        if fault == 'drop':
+            # Close without answering, as an overloaded proxy would
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if fault is not None:
+            headers = {'Retry-After': str(server.retry_after)} if server.retry_after is not None else None
+            self._send(fault, b'Injected fault', headers=headers)
+            return
+
+        page = server.site.page(self.path.split('?', 1)[0])
+        if page is None:
+            self._send(404, b'Not found')
+        else:
+            self._send(200, page[1], page[0])
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local stand-in for the scraped sites that can inject latency and failures.
+
+    `error_rate` is the fraction of requests answered with one of
+    `error_statuses` (with a Retry-After header when `retry_after` is set),
+    and `drop_rate` the fraction whose connection is closed unanswered.
+    Faults are drawn from a seeded generator so runs are repeatable.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, site, port=0, latency=0.0, error_rate=0.0, error_statuses=(503,),
+                 retry_after=None, drop_rate=0.0, seed=0):
+        super().__init__(('127.0.0.1', port), FaultInjectingHandler)
+        self.site = site
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.stats = {'requests': 0, 'errors': 0, 'drops': 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/"
+
+    @property
+    def source_urls(self):
+        """Overrides for scraper.SOURCE_URLS that point every source at this server"""
+        return {
+            'books_toscrape': self.url,
+            'demo_ecommerce': self.url + DEMO_URL,
+            'rss_feed': self.url + FEED_URL,
+        }
+
+    def choose_fault(self):
+        """Counts a request and returns 'drop', an error status or None"""
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            roll = self.random.random()
+            if roll < self.drop_rate:
+                self.stats['drops'] += 1
+                return 'drop'
+            if roll < self.drop_rate + self.error_rate:
+                self.stats['errors'] += 1
+                return self.random.choice(self.error_statuses)
+            return None
+
+def start_server(size=None, rss_items=50, **options):
+    """Starts a FixtureServer for a catalogue of `size` books in a background thread"""
+    server = FixtureServer(FixtureSite(size, rss_items), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    server = start_server()
+    print(f"Serving the fixture catalogue at {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
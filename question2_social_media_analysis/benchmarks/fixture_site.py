@@ -0,0 +1,393 @@
+# question2_social_media_analysis/benchmarks/fixture_site.py
+
+import csv
+import html
+import os
+import re
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOGUE_CSV = os.path.join(CURRENT_DIR, '..', 'data_collection', 'scraped_products.csv')
+FIXTURES_DIR = os.path.join(CURRENT_DIR, 'fixtures')
+
+BOOKS_PER_PAGE = 20
+RATING_WORDS = ['One', 'Two', 'Three', 'Four', 'Five']
+
+DESCRIPTION = (
+    "It's hard to imagine a world without this book. Readers have returned to it again and again, "
+    "and each time they find something new: a turn of phrase, a character they had overlooked, a "
+    "quiet moment that suddenly means everything. This edition includes an introduction and notes. "
+) * 3
+
+def _slugify(title):
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')[:60] or 'book'
+
+def load_catalogue(size=None):
+    """Builds the fixture catalogue from the recorded books.toscrape.com scrape.
+
+    With `size` larger than the recording, books are repeated as new volumes
+    so benchmarks can run against arbitrarily large catalogues.
+    """
+    with open(CATALOGUE_CSV, newline='', encoding='utf-8') as f:
+        recorded = [row for row in csv.DictReader(f) if row['source'] == 'books_toscrape']
+    size = size or len(recorded)
+
+    books = []
+    for book_id in range(1, size + 1):
+        row = recorded[(book_id - 1) % len(recorded)]
+        volume = (book_id - 1) // len(recorded)
+        title = row['title'] if volume == 0 else f"{row['title']} (Vol. {volume + 1})"
+        stock = re.search(r'(\d+) available', row['availability'])
+        books.append({
+            'id': book_id,
+            'title': title,
+            'slug': f"{_slugify(title)}_{book_id}",
+            'price': float(row['price']),
+            'category': row['category'],
+            'rating': row['rating'] if row['rating'] in RATING_WORDS else 'Three',
+            'stock': int(stock.group(1)) if stock else 1,
+        })
+    return books
+
+def category_index(books):
+    """Returns {category: (category_id, slug)} in order of first appearance"""
+    categories = {}
+    for book in books:
+        if book['category'] not in categories:
+            category_id = len(categories) + 2
+            categories[book['category']] = (category_id, f"{_slugify(book['category'])}_{category_id}")
+    return categories
+
+def _page(title, root, breadcrumb, sidebar, content):
+    """Wraps page content in the books.toscrape.com page chrome"""
+    return f"""<!DOCTYPE html>
+<!--[if lt IE 7]>      <html lang="en-us" class="no-js lt-ie9 lt-ie8 lt-ie7"> <![endif]-->
+<!--[if gt IE 8]><!--> <html lang="en-us" class="no-js"> <!--<![endif]-->
+    <head>
+        <title>
+    {html.escape(title)} | Books to Scrape - Sandbox
+</title>
+        <meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+        <meta name="created" content="24th Jun 2016 09:29" />
+        <meta name="description" content="" />
+        <meta name="viewport" content="width=device-width" />
+        <meta name="robots" content="NOARCHIVE,NOCACHE" />
+        <link rel="shortcut icon" href="{root}static/oscar/favicon.ico" />
+        <link rel="stylesheet" type="text/css" href="{root}static/oscar/css/styles.css" />
+        <link rel="stylesheet" href="{root}static/oscar/js/bootstrap-datetimepicker/bootstrap-datetimepicker.css" />
+        <link rel="stylesheet" type="text/css" href="{root}static/oscar/css/datetimepicker.css" />
+    </head>
+    <body id="default" class="default">
+        <header class="header container-fluid">
+            <div class="page_inner">
+                <div class="row">
+                    <div class="col-sm-8 h1"><a href="{root}index.html">Books to Scrape</a><small> We love being scraped!</small>
+</div>
+                </div>
+            </div>
+        </header>
+        <div class="container-fluid page">
+            <div class="page_inner">
+                <ul class="breadcrumb">
+{breadcrumb}
+                </ul>
+                <div class="row">
+{sidebar}
+                    <div class="col-sm-8 col-md-9">
+{content}
+                    </div>
+                </div>
+            </div>
+        </div>
+        <footer class="footer container-fluid">
+        </footer>
+        <script src="{root}static/oscar/js/jquery/jquery-1.9.1.min.js" type="text/javascript" charset="utf-8"></script>
+        <script src="{root}static/oscar/js/bootstrap3/bootstrap.min.js" type="text/javascript" charset="utf-8"></script>
+        <script src="{root}static/oscar/js/oscar/ui.js" type="text/javascript" charset="utf-8"></script>
+        <script type="text/javascript">
+            $(function() {{
+                oscar.init();
+                oscar.search.init();
+            }});
+        </script>
+    </body>
+</html>
+"""
+
+def _sidebar(categories, root):
+    items = '\n'.join(
+        f"""                                        <li>
+                                            <a href="{root}catalogue/category/books/{slug}/index.html">
+                                                {html.escape(name)}
+                                            </a>
+                                        </li>"""
+        for name, (_, slug) in categories.items()
+    )
+    return f"""                    <aside class="sidebar col-sm-4 col-md-3">
+                        <div id="promotions_left">
+                        </div>
+                        <div class="side_categories">
+                            <ul class="nav nav-list">
+                                <li>
+                                    <a href="{root}catalogue/category/books_1/index.html">
+                                        Books
+                                    </a>
+                                    <ul>
+{items}
+                                    </ul>
+                                </li>
+                            </ul>
+                        </div>
+                    </aside>"""
+
+def _product_pod(book, link_prefix, root):
+    title = html.escape(book['title'], quote=True)
+    short = html.escape(book['title'][:20] + ('...' if len(book['title']) > 20 else ''))
+    return f"""                                        <li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">
+    <article class="product_pod">
+            <div class="image_container">
+                    <a href="{link_prefix}{book['slug']}/index.html"><img src="{root}media/cache/{book['id']:04d}.jpg" alt="{title}" class="thumbnail"></a>
+            </div>
+                <p class="star-rating {book['rating']}">
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                    <i class="icon-star"></i>
+                </p>
+            <h3><a href="{link_prefix}{book['slug']}/index.html" title="{title}">{short}</a></h3>
+            <div class="product_price">
+        <p class="price_color">£{book['price']:.2f}</p>
+<p class="instock availability">
+    <i class="icon-ok"></i>
+        In stock
+</p>
+    <form>
+        <button type="submit" class="btn btn-primary btn-block" data-loading-text="Adding...">Add to basket</button>
+    </form>
+            </div>
+    </article>
+</li>"""
+
+def render_listing(books, page, category=None, per_page=BOOKS_PER_PAGE):
+    """Renders a catalogue listing page, or a category page when `category` is given"""
+    categories = category_index(books)
+    if category is None:
+        selection, root, link_prefix, heading = books, '../', '', 'All products'
+    else:
+        selection = [book for book in books if book['category'] == category]
+        root, link_prefix, heading = '../../../../', '../../../', category
+    page_link = 'page-{}.html'
+    total_pages = max(1, -(-len(selection) // per_page))
+    if page < 1 or page > total_pages:
+        return None
+    shown = selection[(page - 1) * per_page:page * per_page]
+
+    pods = '\n'.join(_product_pod(book, link_prefix, root) for book in shown)
+    pager = ''
+    if total_pages > 1:
+        previous = f'<li class="previous"><a href="{page_link.format(page - 1)}">previous</a></li>' if page > 1 else ''
+        following = f'<li class="next"><a href="{page_link.format(page + 1)}">next</a></li>' if page < total_pages else ''
+        pager = f"""                                <div>
+                                    <ul class="pager">
+                                        {previous}
+                                        <li class="current">
+                                            Page {page} of {total_pages}
+                                        </li>
+                                        {following}
+                                    </ul>
+                                </div>"""
+    breadcrumb = f"""                    <li><a href="{root}index.html">Home</a></li>
+                    <li class="active">{html.escape(heading)}</li>"""
+    content = f"""                        <div class="page-header action">
+                            <h1>{html.escape(heading)}</h1>
+                        </div>
+                        <form method="get" class="form-horizontal">
+                            <strong>{len(selection)}</strong> results - showing <strong>{(page - 1) * per_page + 1}</strong> to <strong>{(page - 1) * per_page + len(shown)}</strong>.
+                        </form>
+                        <section>
+                            <div class="alert alert-warning" role="alert"><strong>Warning!</strong> This is a demo website for web scraping purposes. Prices and ratings here were randomly assigned and have no real meaning.</div>
+                            <div>
+                                <ol class="row">
+{pods}
+                                </ol>
+{pager}
+                            </div>
+                        </section>"""
+    return _page(heading, root, breadcrumb, _sidebar(categories, root), content)
+
+def render_index(books):
+    """Renders the home page, which carries the full category sidebar"""
+    categories = category_index(books)
+    pods = '\n'.join(_product_pod(book, 'catalogue/', '') for book in books[:BOOKS_PER_PAGE])
+    breadcrumb = """                    <li><a href="index.html">Home</a></li>
+                    <li class="active">All products</li>"""
+    content = f"""                        <div class="page-header action">
+                            <h1>All products</h1>
+                        </div>
+                        <section>
+                            <div>
+                                <ol class="row">
+{pods}
+                                </ol>
+                            </div>
+                        </section>"""
+    return _page('All products', '', breadcrumb, _sidebar(categories, ''), content)
+
+def render_detail(book, books):
+    """Renders a book's detail page with its breadcrumb and stock count"""
+    category_id, category_slug = category_index(books)[book['category']]
+    title = html.escape(book['title'])
+    breadcrumb = f"""                    <li><a href="../../index.html">Home</a></li>
+                    <li><a href="../category/books_1/index.html">Books</a></li>
+                    <li><a href="../category/books/{category_slug}/index.html">{html.escape(book['category'])}</a></li>
+                    <li class="active">{title}</li>"""
+    content = f"""<article class="product_page"><!-- Start of product page -->
+    <div class="row">
+        <div class="col-sm-6">
+            <div id="product_gallery" class="carousel">
+                <div class="thumbnail">
+                    <div class="carousel-inner">
+                        <div class="item active">
+                            <img src="../../media/cache/{book['id']:04d}.jpg" alt="{title}" />
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>
+        <div class="col-sm-6 product_main">
+            <h1>{title}</h1>
+            <p class="price_color">£{book['price']:.2f}</p>
+            <p class="instock availability">
+                <i class="icon-ok"></i>
+                In stock ({book['stock']} available)
+            </p>
+            <p class="star-rating {book['rating']}">
+                <i class="icon-star"></i>
+                <i class="icon-star"></i>
+                <i class="icon-star"></i>
+                <i class="icon-star"></i>
+                <i class="icon-star"></i>
+            </p>
+            <hr/>
+        </div>
+    </div>
+    <div id="product_description" class="sub-header">
+        <h2>Product Description</h2>
+    </div>
+    <p>{DESCRIPTION}</p>
+    <div class="sub-header">
+        <h2>Product Information</h2>
+    </div>
+    <table class="table table-striped">
+        <tr><th>UPC</th><td>{book['id']:016x}</td></tr>
+        <tr><th>Product Type</th><td>Books</td></tr>
+        <tr><th>Price (excl. tax)</th><td>£{book['price']:.2f}</td></tr>
+        <tr><th>Price (incl. tax)</th><td>£{book['price']:.2f}</td></tr>
+        <tr><th>Tax</th><td>£0.00</td></tr>
+        <tr><th>Availability</th><td>In stock ({book['stock']} available)</td></tr>
+        <tr><th>Number of reviews</th><td>0</td></tr>
+    </table>
+</article><!-- End of product page -->"""
+    return _page(book['title'], '../../', breadcrumb, '', content)
+
+def render_demo_page(page, per_page=6, pages=3):
+    """Renders a webscraper.io 'allinone' product page"""
+    if page < 1 or page > pages:
+        return None
+    cards = []
+    for i in range(per_page):
+        n = (page - 1) * per_page + i
+        stars = '\n'.join('                        <span class="glyphicon glyphicon-star"></span>' for _ in range(1 + n % 5))
+        cards.append(f"""        <div class="col-md-4 col-xl-4 col-lg-4">
+            <div class="card thumbnail">
+                <div class="product-wrapper card-body">
+                    <img class="img-fluid card-img-top image img-responsive" alt="item" src="/images/test-sites/e-commerce/items/cart2.png">
+                    <div class="caption">
+                        <h4 class="price float-end card-title pull-right">${499.99 + n * 37.5:,.2f}</h4>
+                        <h4><a href="/test-sites/e-commerce/allinone/product/{n + 1}" class="title" title="Laptop Model {n + 1}">Laptop Model {n + 1}</a></h4>
+                        <p class="description card-text">15.6", Core i5-{7200 + n}U, 8GB, 256GB SSD, Windows 10 Home</p>
+                    </div>
+                    <div class="ratings">
+                        <p class="review-count float-end">{n % 15} reviews</p>
+                        <p data-rating="{1 + n % 5}">
+{stars}
+                        </p>
+                    </div>
+                </div>
+            </div>
+        </div>""")
+    cards = '\n'.join(cards)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>Web Scraper Test Sites</title>
+    <link rel="stylesheet" href="/css/app.css">
+</head>
+<body>
+<header role="banner" class="navbar navbar-fixed-top navbar-static">
+    <div class="container"><a href="/">Web Scraper</a></div>
+</header>
+<div class="wrapper">
+    <div class="container test-site">
+        <div class="row">
+            <div class="col-md-3 sidebar">
+                <ul class="nav" id="side-menu">
+                    <li><a href="/test-sites/e-commerce/allinone" class="nav-link">Home</a></li>
+                    <li><a href="/test-sites/e-commerce/allinone/computers" class="nav-link">Computers</a></li>
+                    <li><a href="/test-sites/e-commerce/allinone/phones" class="nav-link">Phones</a></li>
+                </ul>
+            </div>
+            <div class="col-md-9">
+                <div class="row">
+{cards}
+                </div>
+            </div>
+        </div>
+    </div>
+</div>
+</body>
+</html>
+"""
+
+def render_rss_feed(items=50):
+    """Renders an RSS 2.0 deals feed with Google Base prices"""
+    entries = '\n'.join(f"""    <item>
+      <title>Deal {i + 1}: Wireless Headphones Model {i + 1}</title>
+      <link>https://example.com/deals/{i + 1}</link>
+      <description>Save on wireless headphones model {i + 1}. Limited time offer while supplies last.</description>
+      <category>Electronics</category>
+      <g:price>${19.99 + i:,.2f}</g:price>
+      <guid>https://example.com/deals/{i + 1}</guid>
+    </item>""" for i in range(items))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">
+  <channel>
+    <title>Daily Deals</title>
+    <link>https://example.com/deals</link>
+    <description>Today's deals</description>
+{entries}
+  </channel>
+</rss>
+"""
+
+def save_fixtures(directory=FIXTURES_DIR):
+    """Writes one page of each kind to `directory` for the extraction benchmarks"""
+    books = load_catalogue()
+    first_category = books[0]['category']
+    pages = {
+        'books_index.html': render_index(books),
+        'books_listing.html': render_listing(books, 1),
+        'books_category.html': render_listing(books, 1, category=first_category),
+        'books_detail.html': render_detail(books[0], books),
+        'demo_products.html': render_demo_page(1),
+        'deals_feed.xml': render_rss_feed(),
+    }
+    os.makedirs(directory, exist_ok=True)
+    for name, content in pages.items():
+        with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+            f.write(content)
+    print(f"Saved {len(pages)} fixture pages to {directory}")
+
+if __name__ == "__main__":
+    save_fixtures()
@@ -0,0 +1,104 @@
+# question2_social_media_analysis/data_collection/extractors.py
+
+import re
+from lxml import etree
+from lxml import html as lxml_html
+from urllib.parse import urljoin
+
+def _has_class(name):
+    """XPath predicate matching elements whose class list contains `name`"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+# Field selectors, compiled once per source. Pages are parsed by libxml2 and
+# the selectors pull out just the product, pager and breadcrumb subtrees.
+BOOKS_XPATHS = {
+    'product': etree.XPath(f'//article[{_has_class("product_pod")}]'),
+    'title': etree.XPath('./h3/a[@title]'),
+    'price': etree.XPath(f'.//p[{_has_class("price_color")}]'),
+    'rating': etree.XPath(f'.//p[{_has_class("star-rating")}]/@class'),
+    'stock': etree.XPath(f'.//p[{_has_class("instock")}]'),
+    'pager': etree.XPath(f'//li[{_has_class("current")}]'),
+    'next_page': etree.XPath(f'//li[{_has_class("next")}]/a/@href'),
+    'breadcrumb': etree.XPath(f'//ul[{_has_class("breadcrumb")}]/li'),
+    'detail_stock': etree.XPath(f'//p[{_has_class("instock")}]'),
+    'categories': etree.XPath(f'//div[{_has_class("side_categories")}]/ul/li/ul/li/a'),
+}
+
+DEMO_XPATHS = {
+    'card': etree.XPath(f'//div[{_has_class("card-body")}]'),
+    'title': etree.XPath(f'.//a[{_has_class("title")}]/@title'),
+    'price': etree.XPath(f'.//h4[{_has_class("price")}]'),
+    'description': etree.XPath(f'.//p[{_has_class("description")}]'),
+    'ratings': etree.XPath(f'.//div[{_has_class("ratings")}]'),
+    'star': etree.XPath(f'.//span[{_has_class("glyphicon-star")}]'),
+}
+
+PAGE_COUNT_PATTERN = re.compile(r'of\s+(\d+)')
+
+# Every site we scrape serves UTF-8; pinning it skips charset sniffing
+HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+def parse_page(content):
+    """Parses an HTML page with lxml's C parser"""
+    return lxml_html.fromstring(content, parser=HTML_PARSER)
+
+def _first(matches):
+    return matches[0] if matches else None
+
+def parse_book_listing(tree, page_url):
+    """Extracts title, price, rating, stock status and detail URL from a listing page"""
+    listings = []
+    for book in BOOKS_XPATHS['product'](tree):
+        link = BOOKS_XPATHS['title'](book)[0]
+        price = BOOKS_XPATHS['price'](book)[0].text_content()
+        stock = _first(BOOKS_XPATHS['stock'](book))
+        listings.append({
+            'title': link.get('title'),
+            'price': float(price[1:]),
+            'rating': BOOKS_XPATHS['rating'](book)[0].split()[1],
+            'availability': stock.text_content().strip() if stock is not None else None,
+            'detail_url': urljoin(page_url, link.get('href'))
+        })
+    return listings
+
+def parse_book_detail(tree):
+    """Extracts category and availability from a book detail page"""
+    category = BOOKS_XPATHS['breadcrumb'](tree)[2].text_content().strip()
+    availability = BOOKS_XPATHS['detail_stock'](tree)[0].text_content().strip()
+    return category, availability
+
+def count_listing_pages(tree):
+    """Reads the total page count from the 'Page 1 of N' pager, if present"""
+    current = _first(BOOKS_XPATHS['pager'](tree))
+    if current is None:
+        return None
+    match = PAGE_COUNT_PATTERN.search(current.text_content())
+    return int(match.group(1)) if match else None
+
+def next_page_url(tree, page_url):
+    """Returns the URL of the next listing page, or None on the last page"""
+    href = _first(BOOKS_XPATHS['next_page'](tree))
+    return urljoin(page_url, href) if href else None
+
+def parse_category_links(tree, page_url):
+    """Returns (category name, URL) pairs from the sidebar of the books.toscrape.com home page"""
+    return [(link.text_content().strip(), urljoin(page_url, link.get('href')))
+            for link in BOOKS_XPATHS['categories'](tree)]
+
+def parse_demo_products(tree):
+    """Extracts title, price, description and star rating from each demo product card"""
+    products = []
+    for card in DEMO_XPATHS['card'](tree):
+        try:
+            price_text = DEMO_XPATHS['price'](card)[0].text_content()
+            ratings = _first(DEMO_XPATHS['ratings'](card))
+            products.append({
+                'title': str(DEMO_XPATHS['title'](card)[0]),
+                'price': float(price_text.replace('$', '').replace(',', '')),
+                'description': str(DEMO_XPATHS['description'](card)[0].text_content()),
+                'rating': len(DEMO_XPATHS['star'](ratings)) if ratings is not None else 0,
+            })
+        except Exception as e:
+            print(f"Error parsing product: {e}")
+            continue
+    return products
@@ -0,0 +1,49 @@
+# question2_social_media_analysis/data_collection/feeds.py
+
+import xml.etree.ElementTree as ET
+
+GOOGLE_BASE_PRICE = '{http://base.google.com/ns/1.0}price'
+ITEM_TAGS = ('item', 'entry')  # RSS <item> and Atom <entry>
+DESCRIPTION_TAGS = ('description', 'summary', 'content')
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+def _item_fields(item):
+    """Reads title, description and category from one pass over an item's children,
+    and the price from anywhere inside it"""
+    fields = {'title': None, 'description': None, 'category': None, 'price': None}
+    price = item.find('.//' + GOOGLE_BASE_PRICE)
+    if price is not None:
+        fields['price'] = price.text
+    for child in item:
+        name = _local_name(child.tag)
+        if name == 'title':
+            fields['title'] = fields['title'] or child.text
+        elif name in DESCRIPTION_TAGS:
+            fields['description'] = fields['description'] or child.text
+        elif name == 'category':
+            # Atom keeps the category name in the term attribute
+            fields['category'] = fields['category'] or child.text or child.get('term')
+    return fields
+
+def iter_feed_items(source):
+    """Streams an RSS or Atom feed from a file-like `source`, yielding each item's fields.
+
+    Items are parsed incrementally and detached from the tree as soon as
+    they have been read, so memory stays flat however large the feed is.
+    """
+    open_elements = []
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(element)
+            continue
+        open_elements.pop()
+        if _local_name(element.tag) not in ITEM_TAGS:
+            continue
+
+        yield _item_fields(element)
+
+        element.clear()
+        if open_elements:
+            open_elements[-1].remove(element)
@@ -0,0 +1,138 @@
+# question2_social_media_analysis/data_collection/http_client.py
+
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from throttle import AdaptiveThrottle, RetryPolicy, retry_after_seconds
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 10
+# Only requests that are safe to send twice are retried
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Hosts we crawl heavily get a larger connection pool
+DEFAULT_HOST_POOL_SIZES = {
+    'http://books.toscrape.com/': 20,
+}
+
+_shared_session = None
+
+class PooledSession(requests.Session):
+    """requests.Session with a default timeout, request pacing and retries.
+
+    Requests are paced by an AdaptiveThrottle when one is given, otherwise
+    by the fixed `requests_per_second` cap. With a RetryPolicy, idempotent
+    requests that fail to connect, time out or get a 429/5xx are retried
+    with jittered exponential backoff.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, requests_per_second=None, throttle=None, retry=None):
+        super().__init__()
+        self.timeout = timeout
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.throttle = throttle
+        self.retry = retry
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
+
+    def _throttle(self):
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _wait(self, url):
+        if self.throttle is not None:
+            self.throttle.wait(url)
+        elif self.min_interval:
+            self._throttle()
+
+    def request(self, method, url, on_retry=None, **kwargs):
+        """Sends a request, retrying it under the session's RetryPolicy.
+
+        `on_retry(response, error, started)` is called for every attempt
+        that is about to be retried, with the failed response or exception.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        retryable = self.retry is not None and method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            self._wait(url)
+            started = time.monotonic()
+            try:
+                response, error = super().request(method, url, **kwargs), None
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                response, error = None, e
+            status_code = response.status_code if response is not None else None
+            retry_after = retry_after_seconds(response)
+            if self.throttle is not None:
+                latency = response.elapsed.total_seconds() if response is not None else None
+                self.throttle.record(url, status_code, latency, retry_after)
+
+            if not retryable or not self.retry.should_retry(attempt, status_code):
+                if error is not None:
+                    raise error
+                return response
+
+            if on_retry is not None:
+                on_retry(response, error, started)
+            if response is not None:
+                response.close()
+            time.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+def create_session(timeout=DEFAULT_TIMEOUT, pool_size=DEFAULT_POOL_SIZE,
+                   host_pool_sizes=None, headers=None, requests_per_second=None,
+                   throttle=None, retry=None):
+    """Creates a keep-alive session with connection pooling.
+
+    `pool_size` is the number of connections kept open per host, and
+    `host_pool_sizes` maps a URL prefix (scheme://host/) to a larger or
+    smaller pool for that host. `requests_per_second` caps the rate at
+    which the session starts requests; an AdaptiveThrottle in `throttle`
+    replaces the fixed cap, and a RetryPolicy in `retry` enables retries.
+    """
+    session = PooledSession(timeout=timeout, requests_per_second=requests_per_second,
+                            throttle=throttle, retry=retry)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if host_pool_sizes is None:
+        host_pool_sizes = DEFAULT_HOST_POOL_SIZES
+    for prefix, size in host_pool_sizes.items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def get_session():
+    """Returns the session shared by all scraper sources, creating it on first use.
+
+    The shared session paces each host adaptively and retries transient failures.
+    """
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session(throttle=AdaptiveThrottle(), retry=RetryPolicy())
+    return _shared_session
+
+def configure_session(**kwargs):
+    """Replaces the shared session with one built from `create_session(**kwargs)`"""
+    global _shared_session
+    if _shared_session is not None:
+        _shared_session.close()
+    _shared_session = create_session(**kwargs)
+    return _shared_session
+
+def ensure_pool_size(session, url, size):
+    """Makes sure the pool used for `url` can hold at least `size` connections"""
+    adapter = session.get_adapter(url)
+    if adapter._pool_maxsize < size:
+        parsed = urlparse(url)
+        session.mount(f"{parsed.scheme}://{parsed.netloc}/",
+                      HTTPAdapter(pool_connections=1, pool_maxsize=size))
@@ -0,0 +1,177 @@
+# question2_social_media_analysis/data_collection/response_cache.py
+
+import hashlib
+import sqlite3
+import threading
+import time
+import requests
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+DEFAULT_MAX_AGE = 30 * 24 * 3600        # entries unused for 30 days are dropped
+
+class ResponseCache:
+    """Persistent HTTP response cache keyed by URL, backed by a SQLite file.
+
+    Stored responses keep their ETag/Last-Modified validators so later
+    fetches can be sent as conditional requests. Entries younger than
+    `fresh_for` seconds are served without any request at all. The cache
+    is pruned to `max_bytes` (least recently used first) and entries not
+    used for `max_age` seconds are dropped.
+    """
+
+    def __init__(self, path, fresh_for=0, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.fresh_for = fresh_for
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)")
+        self.conn.commit()
+        self.stats = {
+            'hits': 0,            # served from cache without a request
+            'revalidated': 0,     # 304 Not Modified, body served from cache
+            'misses': 0,          # full download
+            'bytes_saved': 0,
+            'bytes_downloaded': 0,
+        }
+        self.evict()
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _lookup(self, key):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT url, etag, last_modified, content_type, body, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+    def _store(self, key, response):
+        now = time.time()
+        body = response.content
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                 response.headers.get('Content-Type'), body, len(body), now, now)
+            )
+            self.conn.commit()
+
+    def _touch(self, key, refreshed):
+        now = time.time()
+        with self.lock:
+            if refreshed:
+                self.conn.execute("UPDATE responses SET stored_at = ?, used_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self.conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+
+    def _count(self, stat, amount=1):
+        with self.lock:
+            self.stats[stat] += amount
+
+    @staticmethod
+    def _cached_response(row, status_code=200):
+        url, etag, last_modified, content_type, body, _ = row
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url
+        response._content = body
+        if etag:
+            response.headers['ETag'] = etag
+        if last_modified:
+            response.headers['Last-Modified'] = last_modified
+        if content_type:
+            response.headers['Content-Type'] = content_type
+        response.from_cache = True
+        return response
+
+    def get(self, session, url, **kwargs):
+        """GETs `url` through `session`, using the cache and conditional requests"""
+        key = self._key(url)
+        row = self._lookup(key)
+
+        if row is not None and time.time() - row[5] < self.fresh_for:
+            self._touch(key, refreshed=False)
+            self._count('hits')
+            self._count('bytes_saved', len(row[4]))
+            return self._cached_response(row)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if row is not None:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and row is not None:
+            self._touch(key, refreshed=True)
+            self._count('revalidated')
+            self._count('bytes_saved', len(row[4]))
+            return self._cached_response(row)
+
+        self._count('misses')
+        self._count('bytes_downloaded', len(response.content))
+        if response.status_code == 200:
+            self._store(key, response)
+            self._evict_to_size()
+        response.from_cache = False
+        return response
+
+    def _evict_to_size(self):
+        if self.max_bytes is None:
+            return
+        with self.lock:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self.conn.execute("SELECT key, size FROM responses ORDER BY used_at").fetchall()
+            stale = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((key,))
+                total -= size
+            self.conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+            self.conn.commit()
+
+    def evict(self):
+        """Drops entries older than max_age, then trims the cache to max_bytes"""
+        if self.max_age is not None:
+            with self.lock:
+                self.conn.execute("DELETE FROM responses WHERE used_at < ?", (time.time() - self.max_age,))
+                self.conn.commit()
+        self._evict_to_size()
+
+    def summary(self):
+        """Returns the hit/miss counters along with the cache's current size"""
+        with self.lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            summary = dict(self.stats)
+        lookups = summary['hits'] + summary['revalidated'] + summary['misses']
+        summary['hit_rate'] = round((summary['hits'] + summary['revalidated']) / lookups, 3) if lookups else 0.0
+        summary['entries'] = entries
+        summary['size_bytes'] = size
+        return summary
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,103 @@
+# question2_social_media_analysis/data_collection/scheduler.py
+
+import queue
+import threading
+import time
+from http_client import create_session, DEFAULT_TIMEOUT
+from telemetry import instrument
+from throttle import AdaptiveThrottle, RetryPolicy
+
+DEFAULT_MAX_PENDING = 1000
+_SOURCE_DONE = object()
+
+class SourceScheduler:
+    """Runs registered scraper sources concurrently and merges their records.
+
+    Each source runs in its own thread with its own session, so it gets its
+    own adaptive request rate (never above `requests_per_second`, uncapped
+    when that is None), retries
+    and request timeout, and an optional `deadline`
+    (seconds) after which its remaining records are abandoned. A source
+    that raises is recorded as failed without affecting the others.
+    Records are merged into one stream through a bounded queue. With a
+    CrawlTelemetry, each source's requests are recorded under its name.
+    """
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING, telemetry=None):
+        self.max_pending = max_pending
+        self.telemetry = telemetry
+        self.sources = []
+        self.results = {}
+
+    def register(self, name, scrape, requests_per_second=None, timeout=DEFAULT_TIMEOUT, deadline=None):
+        """Adds a source; `scrape(session)` must return an iterable of records"""
+        self.sources.append({
+            'name': name,
+            'scrape': scrape,
+            'requests_per_second': requests_per_second,
+            'timeout': timeout,
+            'deadline': deadline,
+        })
+
+    def _put(self, records, item, stop):
+        while not stop.is_set():
+            try:
+                records.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_source(self, source, records, stop):
+        name = source['name']
+        result = {'status': 'ok', 'records': 0, 'seconds': 0.0, 'error': None}
+        rate = source['requests_per_second']
+        throttle = AdaptiveThrottle(max_rate=rate) if rate else None
+        session = create_session(timeout=source['timeout'], throttle=throttle, retry=RetryPolicy())
+        session = instrument(session, self.telemetry, name)
+        start = time.monotonic()
+        try:
+            for record in source['scrape'](session):
+                if source['deadline'] is not None and time.monotonic() - start > source['deadline']:
+                    result['status'] = 'timed_out'
+                    print(f"Source {name} exceeded its {source['deadline']}s deadline; stopping it")
+                    break
+                if not self._put(records, record, stop):
+                    result['status'] = 'cancelled'
+                    break
+                result['records'] += 1
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = repr(e)
+            print(f"Source {name} failed: {e}")
+        finally:
+            session.close()
+            result['seconds'] = round(time.monotonic() - start, 3)
+            self.results[name] = result
+            self._put(records, _SOURCE_DONE, stop)
+
+    def run(self):
+        """Starts every source and yields their records as they arrive"""
+        records = queue.Queue(maxsize=self.max_pending)
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self._run_source, args=(source, records, stop),
+                             name=f"source-{source['name']}", daemon=True)
+            for source in self.sources
+        ]
+        for thread in threads:
+            thread.start()
+
+        active = len(threads)
+        try:
+            while active:
+                item = records.get()
+                if item is _SOURCE_DONE:
+                    active -= 1
+                else:
+                    yield item
+        finally:
+            # Unblocks any source still waiting on a full queue if we stop early
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=1)
@@ -1,164 +1,365 @@
 # question2_social_media_analysis/data_collection/scraper.py
 
 import requests
-from bs4 import BeautifulSoup
-import csv
+import argparse
+import asyncio
+import queue
+import threading
 import time
 import json
-import xml.etree.ElementTree as ET
 from datetime import datetime
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from http_client import get_session, ensure_pool_size
+from response_cache import ResponseCache
+from checkpoint import CrawlCheckpoint, listing_hash
+from sinks import open_sink, DEFAULT_BATCH_SIZE
+from scheduler import SourceScheduler
+from feeds import iter_feed_items
+from telemetry import CrawlTelemetry, instrument, parse_timer
+from extractors import (parse_page, parse_book_listing, parse_book_detail, count_listing_pages, next_page_url,
+                        parse_category_links, parse_demo_products)
 
-def scrape_books_toscrape():
-    """Scrapes book data from http://books.toscrape.com/"""
-    base_url = "http://books.toscrape.com/catalogue/page-{}.html"
-    all_books = []
+BOOKS_TOSCRAPE_URL = "http://books.toscrape.com/"
+DEMO_ECOMMERCE_URL = "https://webscraper.io/test-sites/e-commerce/allinone/products/{}"
+# Choose from these demo RSS feeds:
+RSS_FEED_URLS = [
+    "https://www.bestbuy.com/site/rss/deals.xml",
+    "https://www.walmart.com/feeds/ip/4",
+    "https://www.newegg.com/Product/RSS.aspx?Submit=RSSDailyDeals&Depa=1",
+    "https://www.rssboard.org/files/sample-rss-2.xml"  # Fallback test feed
+]
+# Listing pages that may fail in a row (after retries) before a crawl gives up
+MAX_CONSECUTIVE_FAILURES = 3
+
+def build_book_record(listing, category, availability):
+    """Builds the output record for a single book"""
+    return {
+        'source': 'books_toscrape',
+        'title': listing['title'],
+        'price': listing['price'],
+        'category': category,
+        'rating': listing['rating'],
+        'availability': availability,
+        'scraped_at': datetime.now().isoformat()
+    }
+
+def fetch_detail_page(session, url, cache=None, **kwargs):
+    """Fetches a detail page, going through the response cache when one is given"""
+    if cache is not None:
+        return cache.get(session, url, **kwargs)
+    return session.get(url, **kwargs)
+
+def scrape_listing_details(session, listings, cache=None):
+    """Fetches the detail page of each listed book and builds its record
+
+    Books whose detail page still fails after the session's retries are
+    skipped, so callers can tell an incomplete page by its record count.
+    """
+    records = []
+    for book in listings:
+        try:
+            book_response = fetch_detail_page(session, book['detail_url'], cache)
+            book_response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Error scraping book {book['detail_url']}: {e}")
+            continue
+        with parse_timer(session):
+            category, availability = parse_book_detail(parse_page(book_response.content))
+        records.append(build_book_record(book, category, availability))
+    return records
+
+def iter_books_toscrape(base_url=BOOKS_TOSCRAPE_URL, session=None, cache=None, checkpoint=None):
+    """Yields book records from http://books.toscrape.com/ one listing page at a time
+
+    With a CrawlCheckpoint, every finished listing page is saved to disk so
+    an interrupted crawl resumes where it stopped, and in incremental mode
+    the detail pages of unchanged listing pages are not fetched again.
+
+    Pacing and retries come from the session. A listing page that still
+    fails is skipped, and the crawl only stops early after
+    MAX_CONSECUTIVE_FAILURES failed pages in a row.
+    """
+    session = session or get_session()
+    page_url = urljoin(base_url, "catalogue/page-{}.html")
     page_num = 1
+    finished = False
+    failures = 0
+    failed_pages = []
 
     while True:
-        url = base_url.format(page_num)
+        url = page_url.format(page_num)
+        if checkpoint is not None and checkpoint.is_done(url):
+            yield from checkpoint.page_records(url)
+            page_num += 1
+            continue
+
         print(f"Scraping books.toscrape.com page {page_num}...")
 
         try:
-            response = requests.get(url)
+            response = session.get(url)
             response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 404:
+        except requests.exceptions.RequestException as e:
+            if isinstance(e, requests.exceptions.HTTPError) and response.status_code == 404:
                 print("End of pages reached.")
+                finished = True
                 break
-            else:
-                print(f"HTTP error occurred: {e}")
+            print(f"Error scraping page {page_num}: {e}")
+            failed_pages.append(url)
+            failures += 1
+            if failures >= MAX_CONSECUTIVE_FAILURES:
+                print(f"{failures} pages failed in a row. Stopping.")
                 break
-        except requests.exceptions.RequestException as e:
-            print(f"Request error occurred: {e}")
-            break
+            page_num += 1
+            continue
+        failures = 0
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        books = soup.find_all('article', class_='product_pod')
+        with parse_timer(session):
+            books = parse_book_listing(parse_page(response.content), url)
 
         if not books:
             print("No more books found. Stopping.")
+            finished = True
             break
 
-        for book in books:
-            title = book.h3.a['title']
-            price = book.find('p', class_='price_color').text
-            price_cleaned = float(price[1:])
+        if checkpoint is None:
+            yield from scrape_listing_details(session, books, cache)
+        else:
+            page_hash = listing_hash(books)
+            page_records = checkpoint.unchanged_records(url, page_hash)
+            if page_records is None:
+                page_records = scrape_listing_details(session, books, cache)
+            # Incomplete pages are left unsaved so a resumed crawl retries them
+            if len(page_records) < len(books):
+                failed_pages.append(url)
+            else:
+                checkpoint.save_page(url, page_hash, page_records)
+            yield from page_records
 
-            rating_text = book.find('p', class_='star-rating')['class'][1]
-            
-            book_url = 'http://books.toscrape.com/catalogue/' + book.h3.a['href']
-            book_response = requests.get(book_url)
-            book_soup = BeautifulSoup(book_response.content, 'html.parser')
-
-            category = book_soup.find('ul', class_='breadcrumb').find_all('li')[2].text.strip()
-            availability = book_soup.find('p', class_='instock').text.strip()
-
-            all_books.append({
-                'source': 'books_toscrape',
-                'title': title,
-                'price': price_cleaned,
-                'category': category,
-                'rating': rating_text,
-                'availability': availability,
-                'scraped_at': datetime.now().isoformat()
-            })
-        
-        time.sleep(1)
         page_num += 1
 
-    return all_books
+    # Only a crawl that reached the last page without gaps counts as a completed run
+    if checkpoint is not None and finished and not failed_pages:
+        checkpoint.finish()
 
-def scrape_demo_ecommerce():
-    """Scrapes product data from a demo e-commerce site"""
-    base_url = "https://webscraper.io/test-sites/e-commerce/allinone/products/{}"
-    products = []
+def scrape_books_toscrape(base_url=BOOKS_TOSCRAPE_URL, session=None, cache=None, checkpoint=None):
+    """Scrapes book data from http://books.toscrape.com/"""
+    return list(iter_books_toscrape(base_url, session, cache, checkpoint))
+
+async def _fetch_page(url, semaphore, executor, session, timeout, cache=None):
+    """Fetches a URL in a worker thread once a concurrency slot is free; the session paces the host"""
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        if cache is not None:
+            return await loop.run_in_executor(
+                executor, lambda: cache.get(session, url, timeout=timeout)
+            )
+        return await loop.run_in_executor(
+            executor, lambda: session.get(url, timeout=timeout)
+        )
+
+async def _crawl_books_async(base_url, max_concurrency, timeout, session, cache, checkpoint, on_page=None):
+    """Crawls listing and detail pages concurrently.
+
+    Each finished page's records are handed to `on_page` as soon as they are
+    ready; without a callback they are collected and returned in page order.
+    """
+    page_url = urljoin(base_url, "catalogue/page-{}.html")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # Every in-flight request needs its own pooled keep-alive connection
+    ensure_pool_size(session, base_url, max_concurrency)
+    failed_pages = []
+    results = {}
+
+    def emit(page_num, records):
+        if on_page is not None:
+            on_page(records)
+        else:
+            results[page_num] = records
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+        async def fetch(url, cache=None):
+            return await _fetch_page(url, semaphore, executor, session, timeout, cache)
+
+        async def scrape_book(listing):
+            try:
+                response = await fetch(listing['detail_url'], cache)
+                response.raise_for_status()
+                with parse_timer(session):
+                    category, availability = parse_book_detail(parse_page(response.content))
+            except Exception as e:
+                print(f"Error scraping book {listing['detail_url']}: {e}")
+                return None
+            return build_book_record(listing, category, availability)
+
+        async def scrape_listing(page_tree, url):
+            with parse_timer(session):
+                listings = parse_book_listing(page_tree, url)
+            if checkpoint is not None:
+                page_hash = listing_hash(listings)
+                unchanged = checkpoint.unchanged_records(url, page_hash)
+                if unchanged is not None:
+                    checkpoint.save_page(url, page_hash, unchanged)
+                    return unchanged
+
+            books = await asyncio.gather(*[scrape_book(listing) for listing in listings])
+            records = [book for book in books if book is not None]
+            if len(records) < len(listings):
+                failed_pages.append(url)
+            elif checkpoint is not None:
+                checkpoint.save_page(url, page_hash, records)
+            return records
+
+        # The first listing page tells us how many pages there are
+        try:
+            response = await fetch(page_url.format(1))
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Request error occurred: {e}")
+            return []
+        with parse_timer(session):
+            first_page = parse_page(response.content)
+        total_pages = count_listing_pages(first_page) or 1
+        print(f"Scraping {total_pages} books.toscrape.com pages concurrently "
+              f"(max {max_concurrency} in flight)...")
+
+        async def scrape_page(page_num):
+            url = page_url.format(page_num)
+            if checkpoint is not None and checkpoint.is_done(url):
+                emit(page_num, checkpoint.page_records(url))
+                return
+            if page_num == 1:
+                page_tree = first_page
+            else:
+                try:
+                    response = await fetch(url)
+                    response.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    print(f"Error scraping page {page_num}: {e}")
+                    failed_pages.append(url)
+                    return
+                with parse_timer(session):
+                    page_tree = parse_page(response.content)
+            emit(page_num, await scrape_listing(page_tree, url))
+
+        await asyncio.gather(*[scrape_page(page_num) for page_num in range(1, total_pages + 1)])
+
+    if checkpoint is not None and not failed_pages:
+        checkpoint.finish()
+
+    return [book for page_num in sorted(results) for book in results[page_num]]
+
+def scrape_books_toscrape_async(base_url=BOOKS_TOSCRAPE_URL, max_concurrency=10, timeout=10,
+                                session=None, cache=None, checkpoint=None):
+    """Scrapes books.toscrape.com with concurrent listing and detail fetches.
+
+    Returns the same records as scrape_books_toscrape(). At most
+    `max_concurrency` requests are in flight, each host paced by the
+    session's throttle like the other crawl modes.
+    Listing pages are checkpointed as they complete when a CrawlCheckpoint
+    is given.
+    """
+    session = session or get_session()
+    return asyncio.run(_crawl_books_async(base_url, max_concurrency, timeout, session, cache, checkpoint))
+
+def iter_books_toscrape_async(base_url=BOOKS_TOSCRAPE_URL, max_concurrency=10, timeout=10,
+                              session=None, cache=None, checkpoint=None, max_pending_pages=4):
+    """Yields records from the concurrent crawl as each listing page completes.
+
+    The crawl runs in a background thread; once `max_pending_pages` pages are
+    waiting to be consumed it pauses, so memory stays bounded. Pages are
+    yielded in completion order rather than page order.
+    """
+    session = session or get_session()
+    pages = queue.Queue(maxsize=max_pending_pages)
+    errors = []
+
+    def crawl():
+        try:
+            asyncio.run(_crawl_books_async(base_url, max_concurrency, timeout, session, cache, checkpoint,
+                                           on_page=pages.put))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            pages.put(None)
+
+    thread = threading.Thread(target=crawl, daemon=True)
+    thread.start()
+    while (page := pages.get()) is not None:
+        yield from page
+    thread.join()
+    if errors:
+        raise errors[0]
+
+def iter_demo_ecommerce(session=None, base_url=DEMO_ECOMMERCE_URL):
+    """Yields product records from a demo e-commerce site"""
+    session = session or get_session()
     
     for page in range(1, 4):  # Limited to 3 pages for demo
         url = base_url.format(page)
         print(f"Scraping demo e-commerce page {page}...")
         
         try:
-            response = requests.get(url)
+            response = session.get(url)
             response.raise_for_status()
         except Exception as e:
             print(f"Error scraping demo site: {e}")
             continue
             
-        soup = BeautifulSoup(response.content, 'html.parser')
-        product_cards = soup.find_all('div', class_='card-body')
-        
-        for card in product_cards:
-            try:
-                title = card.find('a', class_='title')['title']
-                price_text = card.find('h4', class_='price').text
-                price = float(price_text.replace('$', '').replace(',', ''))
-                
-                description = card.find('p', class_='description').text
-                rating_element = card.find('div', class_='ratings')
-                rating = len(rating_element.find_all('span', class_='glyphicon-star')) if rating_element else 0
-                
-                products.append({
-                    'source': 'demo_ecommerce',
-                    'title': title,
-                    'price': price,
-                    'category': 'Electronics',  # Default category for demo site
-                    'rating': rating,
-                    'availability': 'In stock',  # Default for demo
-                    'description': description,
-                    'scraped_at': datetime.now().isoformat()
-                })
-            except Exception as e:
-                print(f"Error parsing product: {e}")
-                continue
-                
-        time.sleep(1)
-        
-    return products
+        with parse_timer(session):
+            products = parse_demo_products(parse_page(response.content))
+        for product in products:
+            yield {
+                'source': 'demo_ecommerce',
+                'title': product['title'],
+                'price': product['price'],
+                'category': 'Electronics',  # Default category for demo site
+                'rating': product['rating'],
+                'availability': 'In stock',  # Default for demo
+                'description': product['description'],
+                'scraped_at': datetime.now().isoformat()
+            }
 
-def parse_rss_feed(rss_url=None):
-    """Parses RSS feed for additional product data"""
+def scrape_demo_ecommerce(session=None, base_url=DEMO_ECOMMERCE_URL):
+    """Scrapes product data from a demo e-commerce site"""
+    return list(iter_demo_ecommerce(session, base_url))
+
+def iter_rss_feed(rss_url=None, session=None):
+    """Yields product records from an RSS or Atom feed, streamed as it downloads"""
     if rss_url is None:
-        # Choose from these demo RSS feeds:
-        rss_options = [
-            "https://www.bestbuy.com/site/rss/deals.xml",
-            "https://www.walmart.com/feeds/ip/4",
-            "https://www.newegg.com/Product/RSS.aspx?Submit=RSSDailyDeals&Depa=1",
-            "https://www.rssboard.org/files/sample-rss-2.xml"  # Fallback test feed
-        ]
-        rss_url = rss_options[0]  # Use first option by default
+        rss_url = RSS_FEED_URLS[0]  # Use first option by default
     
-    products = []
+    session = session or get_session()
     
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(rss_url, headers=headers, timeout=10)
+        response = session.get(rss_url, headers=headers, timeout=10, stream=True)
         response.raise_for_status()
+        # Let urllib3 undo any gzip/deflate so the parser sees plain XML
+        response.raw.decode_content = True
         
-        root = ET.fromstring(response.content)
-        
-        for item in root.findall('.//item'):
+        for item in iter_feed_items(response.raw):
             try:
-                title = item.find('title').text if item.find('title') is not None else "No Title"
-                description = item.find('description').text if item.find('description') is not None else "No Description"
+                title = item['title'] or "No Title"
+                description = item['description'] or "No Description"
                 
                 # Try to extract price if available
                 price = 0.0
-                price_elem = item.find('.//{http://base.google.com/ns/1.0}price')
-                if price_elem is not None:
+                if item['price'] is not None:
                     try:
-                        price_text = price_elem.text.replace('$', '').replace(',', '')
+                        price_text = item['price'].replace('$', '').replace(',', '')
                         price = float(price_text)
                     except:
                         pass
                 
                 # Try to get category
-                category_elem = item.find('category')
-                category = category_elem.text if category_elem is not None else 'RSS_Products'
+                category = item['category'] or 'RSS_Products'
                 
-                products.append({
+                yield {
                     'source': 'rss_feed',
                     'title': title[:200],  # Limit title length
                     'price': price,
@@ -167,36 +368,227 @@ def parse_rss_feed(rss_url=None):
                     'availability': 'Available',
                     'description': description[:500] if description else "No description",  # Limit length
                     'scraped_at': datetime.now().isoformat()
-                })
+                }
             except Exception as e:
                 print(f"Error parsing RSS item: {e}")
                 continue
                 
     except Exception as e:
         print(f"Error fetching RSS feed {rss_url}: {e}")
-        
-    return products
 
-def scrape_all_sources():
-    """Main function to scrape data from all sources"""
-    all_data = []
+def parse_rss_feed(rss_url=None, session=None):
+    """Parses RSS feed for additional product data"""
+    return list(iter_rss_feed(rss_url, session))
+
+def iter_books_by_category(base_url=BOOKS_TOSCRAPE_URL, session=None, cache=None,
+                           fetch_details=False, delay=0, checkpoint=None):
+    """Yields books.toscrape.com records by walking the category listing pages.
+
+    Each book's category comes from the listing it appears on, so the
+    ~1,000 detail page fetches of scrape_books_toscrape() are replaced by
+    a few dozen listing fetches. Listings only say "In stock" rather than
+    "In stock (22 available)"; pass fetch_details=True to fetch the detail
+    pages for the exact availability text.
+
+    With a CrawlCheckpoint, progress is saved one category at a time.
+    Requests are paced by the session; `delay` adds a fixed pause after
+    each listing page on top of that.
+    """
+    session = session or get_session()
+    failed_categories = []
+
+    try:
+        response = session.get(urljoin(base_url, "index.html"))
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Request error occurred: {e}")
+        return
+
+    with parse_timer(session):
+        categories = parse_category_links(parse_page(response.content), response.url)
+    print(f"Found {len(categories)} categories on books.toscrape.com")
+
+    for category, category_url in categories:
+        if checkpoint is not None and checkpoint.is_done(category_url):
+            yield from checkpoint.page_records(category_url)
+            continue
+
+        # Collect the listings from every page of this category
+        listings = []
+        url = category_url
+        while url:
+            print(f"Scraping books.toscrape.com category '{category}': {url}")
+            try:
+                response = session.get(url)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"Request error occurred: {e}")
+                failed_categories.append(category)
+                break
+
+            with parse_timer(session):
+                page_tree = parse_page(response.content)
+                listings.extend(parse_book_listing(page_tree, url))
+                url = next_page_url(page_tree, url)
+            if delay:
+                time.sleep(delay)
+
+        if category in failed_categories:
+            continue
+
+        records = None
+        if checkpoint is not None:
+            category_hash = listing_hash(listings)
+            records = checkpoint.unchanged_records(category_url, category_hash)
+        if records is None:
+            records = []
+            for book in listings:
+                availability = book['availability']
+                if fetch_details or availability is None:
+                    try:
+                        book_response = fetch_detail_page(session, book['detail_url'], cache)
+                        book_response.raise_for_status()
+                    except requests.exceptions.RequestException as e:
+                        print(f"Error scraping book {book['detail_url']}: {e}")
+                        failed_categories.append(category)
+                        continue
+                    with parse_timer(session):
+                        _, availability = parse_book_detail(parse_page(book_response.content))
+                records.append(build_book_record(book, category, availability))
+        # A category with missing books is left unsaved so a resumed crawl retries it
+        if checkpoint is not None and category not in failed_categories:
+            checkpoint.save_page(category_url, category_hash, records)
+        yield from records
+
+    if checkpoint is not None and not failed_categories:
+        checkpoint.finish()
+
+def scrape_books_by_category(base_url=BOOKS_TOSCRAPE_URL, session=None, cache=None,
+                             fetch_details=False, delay=0, checkpoint=None):
+    """Scrapes books.toscrape.com by walking the category listing pages"""
+    return list(iter_books_by_category(base_url, session, cache, fetch_details, delay, checkpoint))
+
+BOOKS_SCRAPERS = {
+    'sequential': iter_books_toscrape,
+    'async': iter_books_toscrape_async,
+    'category': iter_books_by_category,
+}
+
+# Where each source is scraped from; benchmarks point these at local fixtures
+SOURCE_URLS = {
+    'books_toscrape': BOOKS_TOSCRAPE_URL,
+    'demo_ecommerce': DEMO_ECOMMERCE_URL,
+    'rss_feed': RSS_FEED_URLS[0],
+}
+
+# Per-source limits used when sources are scraped in parallel
+SOURCE_LIMITS = {
+    'books_toscrape': {'requests_per_second': 5, 'timeout': 10, 'deadline': None},
+    'demo_ecommerce': {'requests_per_second': 1, 'timeout': 10, 'deadline': 300},
+    'rss_feed': {'requests_per_second': 1, 'timeout': 10, 'deadline': 120},
+}
+
+def scrape_all_sources(books_mode='sequential', cache_path=None, cache_fresh_for=0,
+                       checkpoint_dir=None, incremental=False,
+                       output_path='scraped_products.csv', batch_size=DEFAULT_BATCH_SIZE,
+                       parallel=False, metrics_path=None, source_urls=None, source_limits=None):
+    """Main function to scrape data from all sources
+
+    Records are streamed from each source straight into the output sink
+    (CSV, JSONL or Parquet, chosen by file extension, or a Parquet dataset
+    partitioned by source and scrape date when the path has no extension)
+    and written in batches, so memory use does not grow with the size of the crawl.
+    With parallel=True the sources run concurrently, each under its own
+    SOURCE_LIMITS, and a failing source does not stop the others.
+    Request latency, status codes, bytes and parse time are tracked per
+    source and written as JSON to `metrics_path` when one is given.
+    `source_urls` and `source_limits` override SOURCE_URLS and
+    SOURCE_LIMITS per source.
+    Returns the number of records written per source.
+    """
+    # Detail pages rarely change between runs, so they can be cached on disk
+    cache = ResponseCache(cache_path, fresh_for=cache_fresh_for) if cache_path else None
+    # Checkpoints make the books crawl resumable (and incremental if requested)
+    checkpoint = None
+    if checkpoint_dir:
+        checkpoint = CrawlCheckpoint(checkpoint_dir, name=f"books_toscrape_{books_mode}",
+                                     incremental=incremental)
     
-    # Scrape from multiple sources
-    all_data.extend(scrape_books_toscrape())
-    all_data.extend(scrape_demo_ecommerce())
-    all_data.extend(parse_rss_feed())
+    urls = {**SOURCE_URLS, **(source_urls or {})}
+    limits = {**SOURCE_LIMITS, **(source_limits or {})}
+
+    # Scrape from multiple sources; each scraper takes the session to use
+    sources = {
+        'books_toscrape': lambda session: BOOKS_SCRAPERS[books_mode](urls['books_toscrape'], session=session,
+                                                                     cache=cache, checkpoint=checkpoint),
+        'demo_ecommerce': lambda session: iter_demo_ecommerce(session, urls['demo_ecommerce']),
+        'rss_feed': lambda session: iter_rss_feed(urls['rss_feed'], session=session),
+    }
     
-    # Save to CSV
-    csv_file = 'scraped_products.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        if all_data:
-            fieldnames = all_data[0].keys()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_data)
+    # Every request and parse is recorded against the source that made it
+    telemetry = CrawlTelemetry()
+
+    # Stream every source into the same output file
+    counts = {}
+    with open_sink(output_path, batch_size=batch_size) as sink:
+        if parallel:
+            scheduler = SourceScheduler(telemetry=telemetry)
+            for name, scrape in sources.items():
+                scheduler.register(name, scrape, **limits[name])
+            sink.write_all(scheduler.run())
+            for name, result in scheduler.results.items():
+                counts[name] = result['records']
+                print(f"Source {name}: {result}")
+        else:
+            for name, scrape in sources.items():
+                counts[name] = sink.write_all(scrape(instrument(get_session(), telemetry, name)))
+    for name, count in counts.items():
+        telemetry.record_records(name, count)
     
-    print(f"Scraping complete! {len(all_data)} products saved to {csv_file}")
-    return all_data
+    print(f"Scraping complete! {sink.count} products saved to {output_path}")
+    if cache is not None:
+        print(f"Response cache: {cache.summary()}")
+        cache.close()
+    if checkpoint is not None:
+        print(f"Crawl checkpoint: {checkpoint.stats}")
+    for name, stats in telemetry.summary()['sources'].items():
+        if not stats['requests']:
+            continue
+        print(f"Telemetry {name}: {stats['requests']} requests, {stats['status_codes']}, "
+              f"p50 {stats['latency_ms']['p50']}ms, p95 {stats['latency_ms']['p95']}ms, "
+              f"{stats['bytes']} bytes, parse {stats['parse_ms']['total']}ms")
+    if metrics_path:
+        telemetry.export_json(metrics_path)
+        print(f"Crawl metrics saved to {metrics_path}")
+    return counts
 
 if __name__ == "__main__":
-    scrape_all_sources()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape product data from all sources")
+    parser.add_argument('--books-mode', choices=sorted(BOOKS_SCRAPERS), default='sequential',
+                        help="crawl strategy for books.toscrape.com")
+    parser.add_argument('--cache', metavar='PATH', default=None,
+                        help="SQLite file for caching book detail pages between runs")
+    parser.add_argument('--cache-fresh-for', metavar='SECONDS', type=float, default=0,
+                        help="serve cached pages younger than this without revalidating")
+    parser.add_argument('--checkpoint-dir', metavar='DIR', default=None,
+                        help="save crawl progress here so an interrupted crawl can resume")
+    parser.add_argument('--incremental', action='store_true',
+                        help="skip detail pages of listings unchanged since the last completed crawl "
+                             "(fields only on detail pages are then not re-checked)")
+    parser.add_argument('--output', metavar='PATH', default='scraped_products.csv',
+                        help="output file (.csv, .jsonl or .parquet), or a directory for a "
+                             "Parquet dataset partitioned by source and scrape date")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="number of records buffered before each write")
+    parser.add_argument('--parallel', action='store_true',
+                        help="scrape all sources concurrently")
+    parser.add_argument('--metrics', metavar='PATH', default=None,
+                        help="write per-source request and parse metrics to this JSON file")
+    args = parser.parse_args()
+    if args.incremental and not args.checkpoint_dir:
+        parser.error("--incremental requires --checkpoint-dir")
+    scrape_all_sources(books_mode=args.books_mode, cache_path=args.cache,
+                       cache_fresh_for=args.cache_fresh_for,
+                       checkpoint_dir=args.checkpoint_dir, incremental=args.incremental,
+                       output_path=args.output, batch_size=args.batch_size,
+                       parallel=args.parallel, metrics_path=args.metrics)
\ No newline at end of file
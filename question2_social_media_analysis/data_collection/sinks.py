@@ -0,0 +1,162 @@
+# question2_social_media_analysis/data_collection/sinks.py
+
+import csv
+import pandas as pd
+import json
+import os
+from storage import PartitionedWriter, is_dataset
+
+# Every source is written with the same columns, whatever fields it fills in
+RECORD_FIELDS = ['source', 'title', 'price', 'category', 'rating', 'availability', 'description', 'scraped_at']
+
+DEFAULT_BATCH_SIZE = 500
+
+def normalize_record(record):
+    """Maps a scraped record onto the unified schema"""
+    return {field: record.get(field) for field in RECORD_FIELDS}
+
+class RecordSink:
+    """Buffers records and writes them out in batches of `batch_size`.
+
+    Subclasses implement `_write_batch()`; memory use is bounded by the
+    batch size rather than by the number of records scraped.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.buffer = []
+        self.count = 0
+
+    def write(self, record):
+        self.buffer.append(normalize_record(record))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, records):
+        """Writes every record from an iterable and returns how many were written"""
+        written = 0
+        for record in records:
+            self.write(record)
+            written += 1
+        return written
+
+    def flush(self):
+        if self.buffer:
+            self._write_batch(self.buffer)
+            self.count += len(self.buffer)
+            self.buffer = []
+
+    def _write_batch(self, batch):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class CSVSink(RecordSink):
+    """Writes records to a CSV file with the unified header"""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=RECORD_FIELDS)
+        self.writer.writeheader()
+
+    def _write_batch(self, batch):
+        self.writer.writerows(batch)
+        self.file.flush()
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+class JSONLSink(RecordSink):
+    """Writes one JSON object per line"""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(path, batch_size)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def _write_batch(self, batch):
+        self.file.writelines(json.dumps(record) + '\n' for record in batch)
+        self.file.flush()
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+def record_schema(scraped_at_type=None):
+    """Arrow schema of the unified record; scraped_at is kept as text unless a type is given"""
+    import pyarrow as pa
+
+    # Ratings are textual for books.toscrape.com and numeric elsewhere
+    return pa.schema([
+        ('source', pa.string()),
+        ('title', pa.string()),
+        ('price', pa.float64()),
+        ('category', pa.string()),
+        ('rating', pa.string()),
+        ('availability', pa.string()),
+        ('description', pa.string()),
+        ('scraped_at', scraped_at_type or pa.string()),
+    ])
+
+class ParquetSink(RecordSink):
+    """Writes each batch as a row group of a Parquet file (requires pyarrow)"""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super().__init__(path, batch_size)
+        self.pa = pa
+        self.schema = record_schema()
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def _write_batch(self, batch):
+        for record in batch:
+            if record['rating'] is not None:
+                record['rating'] = str(record['rating'])
+        self.writer.write_table(self.pa.Table.from_pylist(batch, schema=self.schema))
+
+    def close(self):
+        super().close()
+        self.writer.close()
+
+class PartitionedParquetSink(RecordSink):
+    """Writes batches into a Parquet dataset directory partitioned by source and scrape date"""
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        import pyarrow as pa
+
+        super().__init__(path, batch_size)
+        # Partition columns live in the directory names, not in the files
+        schema = record_schema(pa.timestamp('us'))
+        self.writer = PartitionedWriter(path, schema.remove(schema.get_field_index('source')))
+
+    def _write_batch(self, batch):
+        df = pd.DataFrame(batch, columns=RECORD_FIELDS)
+        df['rating'] = df['rating'].map(lambda rating: None if rating is None else str(rating))
+        df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce', format='mixed')
+        self.writer.write(df)
+
+SINKS = {
+    '.csv': CSVSink,
+    '.jsonl': JSONLSink,
+    '.parquet': ParquetSink,
+}
+
+def open_sink(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Opens the sink matching the file extension of `path`; a path without one is a partitioned dataset"""
+    if is_dataset(path):
+        return PartitionedParquetSink(path, batch_size=batch_size)
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output format '{extension}' (expected one of {', '.join(SINKS)})")
+    return SINKS[extension](path, batch_size=batch_size)
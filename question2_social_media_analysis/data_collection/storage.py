@@ -0,0 +1,268 @@
+# question2_social_media_analysis/data_collection/storage.py
+
+import os
+import shutil
+import pandas as pd
+
+# Datasets are laid out as <root>/source=<source>/scrape_date=<YYYY-MM-DD>/part-N.parquet
+PARTITION_COLUMNS = ['source', 'scrape_date']
+UNKNOWN_PARTITION = 'unknown'
+
+# How load_table types the columns it knows; any others are left as read
+CATEGORICAL_COLUMNS = ['source', 'category', 'availability', 'availability_standardized', 'scrape_date']
+ORDERED_CATEGORIES = {
+    'price_category': ['Budget', 'Affordable', 'Mid-range', 'Premium', 'Luxury'],
+    'rating_category': ['Very Poor', 'Poor', 'Average', 'Good', 'Excellent'],
+}
+# Prices stay float64: cents are not exact in float32 and would print as 47.474998
+FLOAT32_COLUMNS = ['rating', 'sentiment_score']
+DATETIME_COLUMNS = ['scraped_at']
+
+def is_dataset(path):
+    """A path without a file extension (or an existing directory) is a partitioned dataset"""
+    return os.path.isdir(path) or os.path.splitext(path.rstrip('/\\'))[1] == ''
+
+def scrape_dates(scraped_at):
+    """Maps scrape timestamps to the YYYY-MM-DD partition they belong in"""
+    dates = pd.to_datetime(scraped_at, errors='coerce', format='mixed').dt.strftime('%Y-%m-%d')
+    return dates.fillna(UNKNOWN_PARTITION)
+
+class PartitionedWriter:
+    """Writes DataFrames into a Parquet dataset partitioned by source and scrape date.
+
+    Each write adds one file per partition it touches. The first time a
+    partition is touched its earlier contents are removed, so re-running a
+    scrape on the same day replaces that day's data instead of duplicating
+    it. All files share one Arrow schema (the one given, or that of the
+    first frame written), which carries the pandas dtypes through.
+    """
+
+    def __init__(self, root, schema=None):
+        self.root = root
+        self.schema = schema
+        self.touched = set()
+        self.parts = 0
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if 'scrape_date' not in df.columns:
+            df = df.assign(scrape_date=scrape_dates(df['scraped_at']) if 'scraped_at' in df.columns
+                           else UNKNOWN_PARTITION)
+        df = df.assign(source=df['source'].astype(object).fillna(UNKNOWN_PARTITION))
+        data_columns = [column for column in df.columns if column not in PARTITION_COLUMNS]
+        if self.schema is None:
+            self.schema = pa.Schema.from_pandas(df[data_columns], preserve_index=False)
+
+        for (source, scrape_date), part in df.groupby(PARTITION_COLUMNS, sort=False, observed=True):
+            directory = os.path.join(self.root, f"source={source}", f"scrape_date={scrape_date}")
+            if directory not in self.touched:
+                shutil.rmtree(directory, ignore_errors=True)
+                os.makedirs(directory)
+                self.touched.add(directory)
+            table = pa.Table.from_pandas(part[data_columns], schema=self.schema, preserve_index=False)
+            pq.write_table(table, os.path.join(directory, f"part-{self.parts:05d}.parquet"))
+            self.parts += 1
+
+def write_dataset(df, root):
+    """Replaces the dataset at `root` with the rows of `df`"""
+    shutil.rmtree(root, ignore_errors=True)
+    PartitionedWriter(root).write(df)
+
+def read_dataset(root, columns=None, filters=None):
+    """Reads a partitioned dataset, optionally only some columns and partitions.
+
+    `filters` maps a column to a value or list of values, e.g.
+    {'source': 'books_toscrape'}; partition columns are pruned without
+    opening the files of other partitions. Requested columns that the
+    dataset does not have are skipped.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(root, format='parquet', partitioning='hive')
+    if columns is not None:
+        columns = [column for column in columns if column in dataset.schema.names]
+    expression = None
+    for column, values in (filters or {}).items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        condition = ds.field(column).isin(list(values))
+        expression = condition if expression is None else expression & condition
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    # Partition keys come back as dictionaries; sources are plain strings elsewhere
+    if 'source' in df.columns:
+        df['source'] = df['source'].astype(str)
+    if 'scrape_date' in df.columns:
+        df['scrape_date'] = df['scrape_date'].astype(str)
+    return df
+
+def read_table(path, columns=None, filters=None):
+    """Loads a stage's data from a partitioned dataset, Parquet, JSONL or CSV file.
+
+    Only `columns` are read when given (missing ones are skipped).
+    `filters` is only supported for partitioned datasets.
+    """
+    if is_dataset(path):
+        return read_dataset(path, columns, filters)
+    if filters:
+        raise ValueError("filters are only supported for partitioned datasets")
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        import pyarrow.parquet as pq
+        names = pq.read_schema(path).names
+        return pd.read_parquet(path, columns=[c for c in columns if c in names] if columns else None)
+    if extension == '.jsonl':
+        df = pd.read_json(path, lines=True)
+        return df[[c for c in columns if c in df.columns]] if columns else df
+    return pd.read_csv(path, usecols=(lambda column: column in columns) if columns else None)
+
+def optimize_dtypes(df, downcast=True):
+    """Gives known columns compact dtypes, in place: categoricals for low-cardinality text,
+    float32 for ratings and scores (unless `downcast` is False) and parsed datetimes"""
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            # Mostly-distinct values take more memory as categories than as strings
+            if df[column].nunique() <= len(df) / 2:
+                df[column] = df[column].astype('category')
+    for column, labels in ORDERED_CATEGORIES.items():
+        if column in df.columns:
+            df[column] = df[column].astype(pd.CategoricalDtype(labels, ordered=True))
+    if downcast:
+        for column in FLOAT32_COLUMNS:
+            if column in df.columns and pd.api.types.is_numeric_dtype(df[column]) \
+                    and not pd.api.types.is_bool_dtype(df[column]):
+                df[column] = df[column].astype('float32')
+    for column in DATETIME_COLUMNS:
+        if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], errors='coerce', format='ISO8601')
+    return df
+
+def load_table(path, columns=None, filters=None, downcast=True, report=False):
+    """read_table with compact dtypes for the columns every stage shares (see optimize_dtypes)
+
+    Prints how much memory the frame takes as read and after conversion,
+    and with `report`, a per-column breakdown.
+    """
+    df = read_table(path, columns, filters)
+    dtypes_before = df.dtypes
+    memory_before = df.memory_usage(deep=True, index=False)
+    optimize_dtypes(df, downcast)
+    memory_after = df.memory_usage(deep=True, index=False)
+
+    megabytes = 1024 * 1024
+    print(f"Loaded {len(df)} rows: {memory_before.sum() / megabytes:.1f} MB as read, "
+          f"{memory_after.sum() / megabytes:.1f} MB with optimized dtypes")
+    if report:
+        print(pd.DataFrame({
+            'dtype as read': dtypes_before.astype(str),
+            'MB as read': (memory_before / megabytes).round(2),
+            'dtype': df.dtypes.astype(str),
+            'MB': (memory_after / megabytes).round(2),
+        }).to_string())
+    return df
+
+def iter_table(path, chunksize, columns=None, dtype=None):
+    """Reads a stage's data as DataFrames of at most `chunksize` rows, in file order.
+
+    `dtype` (column -> dtype) is applied to CSV and JSONL chunks so a column
+    that happens to be empty in one chunk is typed like in the others.
+    """
+    if is_dataset(path):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        if columns is not None:
+            columns = [column for column in columns if column in dataset.schema.names]
+        for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+            df = batch.to_pandas()
+            for column in PARTITION_COLUMNS:
+                if column in df.columns:
+                    df[column] = df[column].astype(str)
+            yield df
+        return
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            columns = [column for column in columns if column in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    if extension == '.jsonl':
+        with pd.read_json(path, lines=True, chunksize=chunksize, dtype=dtype) as reader:
+            for df in reader:
+                yield df[[c for c in columns if c in df.columns]] if columns else df
+        return
+    if columns is not None and dtype is not None:
+        dtype = {column: value for column, value in dtype.items() if column in columns}
+    with pd.read_csv(path, chunksize=chunksize, dtype=dtype,
+                     usecols=(lambda column: column in columns) if columns else None) as reader:
+        yield from reader
+
+def _concrete_schema(schema):
+    """Types columns that were entirely empty in the first chunk (null, list<null>) as strings"""
+    import pyarrow as pa
+
+    def concrete(field_type):
+        if pa.types.is_null(field_type):
+            return pa.string()
+        if pa.types.is_list(field_type) or pa.types.is_large_list(field_type):
+            return pa.list_(concrete(field_type.value_type))
+        return field_type
+
+    return pa.schema([field.with_type(concrete(field.type)) for field in schema], metadata=schema.metadata)
+
+class TableWriter:
+    """Appends DataFrames to a partitioned dataset, Parquet, JSONL or CSV file depending on `path`.
+
+    The output is replaced on the first write. Parquet output keeps the
+    schema of the first frame, so later frames must have the same columns.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+
+        if is_dataset(self.path):
+            if self.writer is None:
+                shutil.rmtree(self.path, ignore_errors=True)
+                data = df.drop(columns=[c for c in PARTITION_COLUMNS if c in df.columns])
+                self.writer = PartitionedWriter(self.path, _concrete_schema(
+                    pa.Schema.from_pandas(data, preserve_index=False)))
+            self.writer.write(df)
+        elif os.path.splitext(self.path)[1].lower() == '.parquet':
+            import pyarrow.parquet as pq
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, _concrete_schema(
+                    pa.Schema.from_pandas(df, preserve_index=False)))
+            self.writer.write_table(pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False))
+        elif os.path.splitext(self.path)[1].lower() == '.jsonl':
+            df.to_json(self.path, orient='records', lines=True, date_format='iso', mode='a' if self.rows else 'w')
+        else:
+            df.to_csv(self.path, index=False, mode='a' if self.rows else 'w', header=not self.rows)
+        self.rows += len(df)
+
+    def close(self):
+        if hasattr(self.writer, 'close'):
+            self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_table(df, path):
+    """Saves a stage's output as a partitioned dataset, Parquet, JSONL or CSV file depending on `path`"""
+    if is_dataset(path):
+        write_dataset(df, path)
+    elif os.path.splitext(path)[1].lower() == '.parquet':
+        df.to_parquet(path, index=False)
+    elif os.path.splitext(path)[1].lower() == '.jsonl':
+        df.to_json(path, orient='records', lines=True, date_format='iso')
+    else:
+        df.to_csv(path, index=False)
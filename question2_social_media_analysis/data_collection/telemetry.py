@@ -0,0 +1,214 @@
+# question2_social_media_analysis/data_collection/telemetry.py
+
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+import requests
+from http_client import PooledSession
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+class SourceStats:
+    """Counters for one source; updated under CrawlTelemetry's lock"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.status_codes = Counter()
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.parse_count = 0
+        self.parse_total = 0.0
+        self.records = 0
+        self.first_request = None
+        self.last_response = None
+
+    def add_latency(self, seconds):
+        ms = seconds * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.latency_buckets[i] += 1
+                break
+        else:
+            self.latency_buckets[-1] += 1
+        self.latency_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+
+    def latency_percentile(self, fraction):
+        """Approximates a latency percentile (ms) by the upper bound of its bucket"""
+        total = sum(self.latency_buckets)
+        if not total:
+            return None
+        target = fraction * total
+        seen = 0
+        for i, count in enumerate(self.latency_buckets):
+            seen += count
+            if seen >= target:
+                # The true value is no larger than the slowest request seen
+                upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float('inf')
+                return round(min(upper, self.latency_max * 1000), 1)
+
+    def summary(self):
+        timed = sum(self.latency_buckets)
+        elapsed = (self.last_response - self.first_request) if self.first_request is not None else 0.0
+        histogram = {f"<={bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_buckets)}
+        histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = self.latency_buckets[-1]
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'status_codes': {code: count for code, count in sorted((str(code), count) for code, count in self.status_codes.items())},
+            'bytes': self.bytes,
+            'latency_ms': {
+                'mean': round(self.latency_total / timed * 1000, 1) if timed else None,
+                'p50': self.latency_percentile(0.50),
+                'p95': self.latency_percentile(0.95),
+                'p99': self.latency_percentile(0.99),
+                'max': round(self.latency_max * 1000, 1),
+                'histogram': histogram,
+            },
+            'parse_ms': {
+                'count': self.parse_count,
+                'total': round(self.parse_total * 1000, 1),
+                'mean': round(self.parse_total / self.parse_count * 1000, 2) if self.parse_count else None,
+            },
+            'records': self.records,
+            'elapsed_seconds': round(elapsed, 3),
+            'requests_per_second': round(self.requests / elapsed, 2) if elapsed else None,
+            'bytes_per_second': round(self.bytes / elapsed, 1) if elapsed else None,
+        }
+
+class CrawlTelemetry:
+    """Thread-safe per-source request, parse and throughput metrics for a crawl"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sources = {}
+        self.started = time.time()
+
+    def _stats(self, source):
+        if source not in self.sources:
+            self.sources[source] = SourceStats()
+        return self.sources[source]
+
+    def record_request(self, source, started, finished, latency, status_code=None, size=0):
+        """Records one HTTP request; status_code is None when it raised"""
+        with self.lock:
+            stats = self._stats(source)
+            stats.requests += 1
+            if status_code is None:
+                stats.errors += 1
+                stats.status_codes['error'] += 1
+            else:
+                stats.status_codes[status_code] += 1
+            stats.bytes += size
+            stats.add_latency(latency)
+            if stats.first_request is None or started < stats.first_request:
+                stats.first_request = started
+            stats.last_response = max(stats.last_response or finished, finished)
+
+    def record_retry(self, source):
+        with self.lock:
+            self._stats(source).retries += 1
+
+    def record_parse(self, source, seconds):
+        with self.lock:
+            stats = self._stats(source)
+            stats.parse_count += 1
+            stats.parse_total += seconds
+
+    def record_records(self, source, count):
+        with self.lock:
+            self._stats(source).records += count
+
+    @contextmanager
+    def parse_timer(self, source):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_parse(source, time.perf_counter() - start)
+
+    def summary(self):
+        with self.lock:
+            return {
+                'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+                'duration_seconds': round(time.time() - self.started, 3),
+                'latency_buckets_ms': LATENCY_BUCKETS_MS,
+                'sources': {name: stats.summary() for name, stats in sorted(self.sources.items())},
+            }
+
+    def export_json(self, path):
+        """Writes the summary to `path` and returns it"""
+        summary = self.summary()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+class InstrumentedSession:
+    """Wraps a session so every request it makes is recorded against `source`.
+
+    Everything other than `request`/`get` is delegated to the wrapped
+    session, so it can be passed anywhere a session is expected.
+    """
+
+    def __init__(self, session, telemetry, source):
+        self.session = session
+        self.telemetry = telemetry
+        self.source = source
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def _record(self, response, error, started, stream):
+        finished = time.monotonic()
+        if error is not None:
+            self.telemetry.record_request(self.source, started, finished, finished - started)
+            return
+        if stream:
+            # Streamed bodies are read later by the parser; use the declared size
+            size = int(response.headers.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        # elapsed covers send to response headers, leaving out any client-side throttling wait
+        self.telemetry.record_request(self.source, started, finished, response.elapsed.total_seconds(),
+                                      response.status_code, size)
+
+    def _record_retry(self, response, error, started, stream):
+        self._record(response, error, started, stream)
+        self.telemetry.record_retry(self.source)
+
+    def request(self, method, url, **kwargs):
+        stream = kwargs.get('stream', False)
+        if isinstance(self.session, PooledSession):
+            # Failed attempts are recorded as they happen, each counting as a retry
+            kwargs['on_retry'] = lambda response, error, started: self._record_retry(response, error, started, stream)
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self._record(None, e, started, stream)
+            raise
+        self._record(response, None, started, stream)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+def instrument(session, telemetry, source):
+    """Returns `session` wrapped for telemetry, or unchanged when telemetry is None"""
+    if telemetry is None:
+        return session
+    return InstrumentedSession(session, telemetry, source)
+
+def parse_timer(session):
+    """Times a parse against the session's source if the session is instrumented"""
+    if isinstance(session, InstrumentedSession):
+        return session.telemetry.parse_timer(session.source)
+    return nullcontext()
@@ -0,0 +1,108 @@
+# question2_social_media_analysis/data_collection/throttle.py
+
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_INITIAL_RATE = 2.0
+DEFAULT_MIN_RATE = 0.2
+DEFAULT_MAX_RATE = 10.0
+
+# Statuses that mean the server is overloaded or briefly unavailable
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def is_overloaded(status_code):
+    """True for a failed request (None) or a status asking us to slow down"""
+    return status_code is None or status_code in RETRY_STATUSES
+
+def retry_after_seconds(response):
+    """Reads a numeric Retry-After header, or returns None"""
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveThrottle:
+    """Paces requests per host, speeding up while the host is healthy and backing off when it is not.
+
+    Each host starts at `initial_rate` requests per second. Every healthy
+    response adds `increase` to the rate, up to `max_rate`; a 429, a 5xx or a
+    connection failure multiplies it by `decrease`, down to `min_rate`, and
+    responses slower than `slow_latency` seconds hold the rate where it is.
+    A Retry-After header pauses the host for at least that long.
+    """
+
+    def __init__(self, initial_rate=DEFAULT_INITIAL_RATE, min_rate=DEFAULT_MIN_RATE,
+                 max_rate=DEFAULT_MAX_RATE, increase=0.5, decrease=0.5, slow_latency=2.0):
+        self.initial_rate = min(initial_rate, max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        self.rates = {}
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def rate(self, url):
+        """Current requests-per-second allowance for the host of `url`"""
+        with self.lock:
+            return self.rates.get(urlparse(url).netloc, self.initial_rate)
+
+    def wait(self, url):
+        """Blocks until the host of `url` may receive another request"""
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            rate = self.rates.get(host, self.initial_rate)
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + 1.0 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, url, status_code=None, latency=None, retry_after=None):
+        """Adjusts the host's rate from the outcome of one request"""
+        host = urlparse(url).netloc
+        with self.lock:
+            rate = self.rates.get(host, self.initial_rate)
+            if is_overloaded(status_code):
+                rate = max(self.min_rate, rate * self.decrease)
+                # Push the next request out to the slower rate (or Retry-After) straight away
+                pause = max(1.0 / rate, retry_after or 0.0)
+                self.next_slot[host] = max(self.next_slot.get(host, 0.0), time.monotonic() + pause)
+            elif latency is None or latency <= self.slow_latency:
+                rate = min(self.max_rate, rate + self.increase)
+            self.rates[host] = rate
+
+    def summary(self):
+        """Current rate per host"""
+        with self.lock:
+            return {host: round(rate, 2) for host, rate in self.rates.items()}
+
+class RetryPolicy:
+    """How often and how long to wait before retrying a failed request.
+
+    Waits use exponential backoff with full jitter: attempt n sleeps a
+    random time between 0 and min(max_delay, base_delay * 2**n), or the
+    server's Retry-After if that is longer.
+    """
+
+    def __init__(self, max_retries=3, base_delay=0.5, max_delay=30.0, statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = statuses
+
+    def should_retry(self, attempt, status_code=None):
+        """True if attempt number `attempt` (0-based) failed in a retryable way and retries remain"""
+        if attempt >= self.max_retries:
+            return False
+        return status_code is None or status_code in self.statuses
+
+    def delay(self, attempt, retry_after=None):
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(backoff, retry_after or 0.0)
@@ -3,9 +3,72 @@
 import pandas as pd
 import re
 import os
+import sys
+import argparse
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from operator import itemgetter
+from importlib.metadata import version
 from textblob import TextBlob
+from sentiment_cache import SentimentCache
+from streaming import SeenRows, StreamingQuantiles
+from near_duplicates import CLUSTER_COLUMNS
+from validation import (validate, format_issues, in_range, not_null, matches, allowed_values,
+                        cross_field)
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+from storage import read_table, load_table, write_table, iter_table, TableWriter, ORDERED_CATEGORIES  # noqa: E402
+
+DEFAULT_INPUT_PATH = os.path.join(CURRENT_DIR, '..', 'data_collection', 'scraped_products.csv')
+DEFAULT_OUTPUT_PATH = os.path.join(CURRENT_DIR, 'cleaned_products.csv')
+DEFAULT_SENTIMENT_CACHE_PATH = os.path.join(CURRENT_DIR, 'sentiment_cache.sqlite')
+
+# Rows read at a time by clean_data_chunked
+DEFAULT_CHUNKSIZE = 100_000
+# Rows per partition suggested for cleaning in parallel
+DEFAULT_PARTITION_SIZE = 50_000
+# Rows with the same key are duplicates; rows missing a critical column are dropped
+DUPLICATE_KEY = ['title', 'source']
+CRITICAL_COLUMNS = ['title', 'price']
+# Columns that change on every scrape without the product changing
+FINGERPRINT_EXCLUDED_COLUMNS = ['scraped_at']
+# Free-text columns, read as strings in every chunk even when one chunk has none
+TEXT_DTYPES = {column: 'str' for column in
+               ['title', 'category', 'availability', 'description', 'source', 'rating']}
+
+# Checks on cleaned records; rules on columns a frame lacks are skipped
+CLEANED_DATA_RULES = [
+    in_range('invalid prices', 'price', min_value=0, min_inclusive=False),
+    in_range('invalid ratings', 'rating', 0, 5),
+    not_null('missing titles', 'title'),
+    not_null('missing prices', 'price'),
+    in_range('invalid sentiment scores', 'sentiment_score', -1, 1),
+    # Cleaned text is trimmed and single-spaced
+    matches('unnormalized clean titles', 'title_clean', r'(?:\S+(?: \S+)*)?'),
+    allowed_values('unknown availability', 'availability_standardized', ['In Stock', 'Out of Stock', 'Unknown']),
+    allowed_values('unknown price categories', 'price_category', ORDERED_CATEGORIES['price_category']),
+    cross_field('price categories not matching prices', ['price', 'price_category'],
+                lambda df: price_categories(df['price']).astype(object).eq(df['price_category'].astype(object))
+                | df['price_category'].isna()),
+]
+
+# Cached scores are only reused for the same scorer
+SENTIMENT_MODEL = f"textblob-{version('textblob')}-pattern"
+# Below this many texts to score, starting a process pool costs more than it saves
+MIN_PARALLEL_TEXTS = 1000
+
+# Special characters (anything but word characters, whitespace and basic punctuation)
+SPECIAL_CHARACTERS = re.compile(r'[^\w\s\.\,\!\?]')
+WHITESPACE = re.compile(r'\s+')
+# The same patterns spelled out for ASCII text, for pyarrow's RE2 engine; on
+# ASCII, Python's \s (and str.strip) also match \x0b and the \x1c-\x1f separators
+ASCII_SPECIAL_CHARACTERS = r'[^0-9A-Za-z_\t\n\x0b\x0c\r\x1c-\x1f .,!?]+'
+# Only whitespace that is not already a single space needs replacing
+ASCII_WHITESPACE = r'[\t\n\x0b\x0c\r\x1c-\x1f ]{2,}|[\t\n\x0b\x0c\r\x1c-\x1f]'
 
 def clean_text(text):
     """Advanced text cleaning and normalization"""
@@ -14,14 +77,63 @@ def clean_text(text):
     
     text = str(text)
     # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s\.\,\!\?]', '', text)
+    text = SPECIAL_CHARACTERS.sub('', text)
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = WHITESPACE.sub(' ', text).strip()
     # Convert to lowercase for consistency
     text = text.lower()
     
     return text
 
+def _clean_texts_pandas(texts):
+    return (pd.Series(texts, dtype=object)
+            .str.replace(SPECIAL_CHARACTERS, '', regex=True)
+            .str.replace(WHITESPACE, ' ', regex=True)
+            .str.strip()
+            .str.lower()
+            .to_numpy(dtype=object))
+
+def _replace_matching(strings, pattern, replacement):
+    """pyarrow regex replace that only rewrites the strings the pattern occurs in"""
+    import pyarrow.compute as pc
+
+    matched = pc.match_substring_regex(strings, pattern)
+    if not pc.any(matched).as_py():
+        return strings
+    replaced = pc.replace_substring_regex(pc.filter(strings, matched), pattern, replacement)
+    return pc.replace_with_mask(strings, matched, replaced)
+
+def _clean_texts(texts):
+    """Cleans an array of strings; ASCII ones in pyarrow compute kernels when it is installed"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return _clean_texts_pandas(texts)
+
+    strings = pa.array(texts, type=pa.large_string())
+    is_ascii = pc.string_is_ascii(strings).to_numpy(zero_copy_only=False)
+    ascii_texts = pc.filter(strings, pa.array(is_ascii))
+    ascii_texts = _replace_matching(ascii_texts, ASCII_SPECIAL_CHARACTERS, '')
+    ascii_texts = _replace_matching(ascii_texts, ASCII_WHITESPACE, ' ')
+    ascii_texts = pc.ascii_lower(pc.utf8_trim(ascii_texts, ' '))
+
+    cleaned = np.empty(len(texts), dtype=object)
+    cleaned[is_ascii] = ascii_texts.to_numpy(zero_copy_only=False)
+    # Unicode \w, \s and lowercasing need Python's own rules
+    cleaned[~is_ascii] = _clean_texts_pandas(texts[~is_ascii])
+    return cleaned
+
+def clean_text_series(texts):
+    """Vectorized clean_text for a whole column, giving the same result for every row
+
+    Each distinct value is cleaned once, with pyarrow's compute kernels for
+    ASCII text and pandas string operations otherwise, and the results are
+    mapped back to the rows, so repeated titles and descriptions cost
+    nothing extra.
+    """
+    return pd.Series(_map_distinct(texts, _clean_texts, '', batch=True), index=texts.index, name=texts.name)
+
 def extract_sentiment(text):
     """Extract sentiment score from text descriptions"""
     if pd.isna(text) or text == "":
@@ -31,6 +143,44 @@ def extract_sentiment(text):
     except:
         return 0.0
 
+def score_sentiments(texts, cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None):
+    """Scores a whole column of texts, giving the same result as extract_sentiment for every row
+
+    Each distinct text is scored once. Scores are kept in a SQLite cache
+    keyed by a hash of the text (None disables it), so descriptions seen on
+    earlier runs are not scored again, and the remaining texts are scored
+    in a pool of `workers` processes (1 scores in this process).
+    """
+    scores = _map_distinct(texts, lambda distinct: _score_distinct(distinct, cache_path, workers), 0.0, batch=True)
+    return pd.Series(scores.astype(float), index=texts.index, name=texts.name)
+
+def _score_distinct(texts, cache_path, workers):
+    """Sentiment scores of distinct texts, from the cache where it has them"""
+    to_score = [text for text in texts if text != ""]
+
+    scores = {}
+    cache = SentimentCache(cache_path, SENTIMENT_MODEL) if cache_path else None
+    if cache is not None:
+        scores.update(cache.get_many(to_score))
+        to_score = [text for text in to_score if text not in scores]
+
+    workers = workers or os.cpu_count() or 1
+    if len(to_score) >= MIN_PARALLEL_TEXTS and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            new_scores = list(pool.map(extract_sentiment, to_score,
+                                       chunksize=max(1, len(to_score) // (workers * 4))))
+    else:
+        new_scores = [extract_sentiment(text) for text in to_score]
+    new_scores = dict(zip(to_score, new_scores))
+    scores.update(new_scores)
+
+    if cache is not None:
+        cache.put_many(new_scores)
+        print(f"Sentiment cache: {cache.summary()}")
+        cache.close()
+
+    return [scores.get(text, 0.0) for text in texts]
+
 def extract_hashtags_mentions(text):
     """Extract hashtags and mentions from text (for social media analysis)"""
     if pd.isna(text):
@@ -73,115 +223,394 @@ def convert_rating(rating):
     except:
         return 0
 
-def validate_data(df):
-    """Comprehensive data validation"""
-    validation_issues = []
-    
-    # Price validation
-    invalid_prices = df[df['price'] <= 0]
-    if len(invalid_prices) > 0:
-        validation_issues.append(f"Found {len(invalid_prices)} records with invalid prices")
-    
-    # Rating validation
-    invalid_ratings = df[(df['rating'] < 0) | (df['rating'] > 5)]
-    if len(invalid_ratings) > 0:
-        validation_issues.append(f"Found {len(invalid_ratings)} records with invalid ratings")
-    
-    # Missing critical fields
-    missing_titles = df[df['title'].isna() | (df['title'] == '')]
-    if len(missing_titles) > 0:
-        validation_issues.append(f"Found {len(missing_titles)} records with missing titles")
-    
-    return validation_issues
+def count_validation_issues(df):
+    """Number of records failing each validation rule"""
+    return validate(df, CLEANED_DATA_RULES).counts
 
-def clean_data():
-    """
-    Enhanced data cleaning pipeline with comprehensive preprocessing
-    """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    input_file_path = os.path.join(current_dir, '..', 'data_collection', 'scraped_products.csv')
-    output_file_path = os.path.join(current_dir, 'cleaned_products.csv')
+def _map_distinct(values, func, missing, batch=False):
+    """Applies `func` once per distinct value of a column and maps the results back to its rows;
+    missing values get `missing`. With `batch`, `func` is given every distinct value at once and
+    returns their results in order"""
+    if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+        # Convert before factorizing, which would otherwise merge 1, 1.0 and True
+        values = values.map(str, na_action='ignore')
+    codes, uniques = pd.factorize(values)
+    found = func(np.asarray(uniques, dtype=object)) if batch else map(func, uniques)
+    results = np.empty(len(uniques) + 1, dtype=object)
+    # fromiter keeps results that are sequences (lists, tuples) as single objects
+    results[:-1] = np.fromiter(found, dtype=object, count=len(uniques))
+    # Missing values have code -1, which picks the trailing entry
+    results[-1] = missing
+    return results[codes]
 
-    print(f"Reading data from {input_file_path}...")
+def convert_rating_series(ratings):
+    """convert_rating for a whole column, computed once per distinct value; whole numbers only
+    give integers, as Series.apply(convert_rating) would"""
+    return pd.Series(_map_distinct(ratings, convert_rating, 0), index=ratings.index,
+                     name=ratings.name).infer_objects()
 
-    try:
-        df = pd.read_csv(input_file_path)
-    except FileNotFoundError:
-        print(f"Error: The file '{input_file_path}' was not found.")
-        return
+def standardize_availability_series(availability):
+    """standardize_availability for a whole column, computed once per distinct value"""
+    return pd.Series(_map_distinct(availability, standardize_availability, "Unknown"),
+                     index=availability.index, name=availability.name)
 
-    print("Starting comprehensive data cleaning...")
-    initial_count = len(df)
+def extract_hashtags_mentions_series(texts):
+    """extract_hashtags_mentions for a whole column, as (hashtags, mentions) Series of lists
 
-    # 1. Handle duplicates
-    df.drop_duplicates(subset=['title', 'source'], inplace=True)
-    print(f"Removed {initial_count - len(df)} duplicate rows.")
+    Both patterns run once per distinct text in a single findall pass, and
+    rows with the same text share the resulting lists.
+    """
+    def split_tags(distinct):
+        for found in pd.Series(distinct, dtype=object).str.findall(r'[#@]\w+'):
+            yield [tag for tag in found if tag[0] == '#'], [tag for tag in found if tag[0] == '@']
+
+    tags = _map_distinct(texts, split_tags, ([], []), batch=True)
+    hashtags, mentions = (np.fromiter(map(itemgetter(part), tags), dtype=object, count=len(tags)) for part in (0, 1))
+    return (pd.Series(hashtags, index=texts.index, name='hashtags'),
+            pd.Series(mentions, index=texts.index, name='mentions'))
+
+def validate_data(df):
+    """Comprehensive data validation"""
+    return validate(df, CLEANED_DATA_RULES).issues()
 
+def report_validation(validation_issues):
+    if validation_issues:
+        print("Validation issues found:")
+        for issue in validation_issues:
+            print(f"  - {issue}")
+    else:
+        print("Data validation passed successfully")
+
+def preprocess_records(df, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None, sentiment=True):
+    """Cleans text, numeric, categorical and date fields row by row (steps that need no other rows);
+    without `sentiment`, sentiment_score is left for the caller to add (see add_sentiment)"""
     # 2. Text preprocessing
-    df['title_clean'] = df['title'].apply(clean_text)
+    df['title_clean'] = clean_text_series(df['title'])
     if 'description' in df.columns:
-        df['description_clean'] = df['description'].apply(clean_text)
-        df['sentiment_score'] = df['description_clean'].apply(extract_sentiment)
+        df['description_clean'] = clean_text_series(df['description'])
+        if sentiment:
+            add_sentiment(df, sentiment_cache_path, workers)
         
         # Extract hashtags and mentions
-        df[['hashtags', 'mentions']] = df['description_clean'].apply(
-            lambda x: pd.Series(extract_hashtags_mentions(x))
-        )
+        df['hashtags'], df['mentions'] = extract_hashtags_mentions_series(df['description_clean'])
 
     # 3. Standardize numerical fields
-    df['price'] = pd.to_numeric(df['price'], errors='coerce')
-    df['rating'] = df['rating'].apply(convert_rating)
-    
-    # Ensure rating is between 0-5
-    df['rating'] = df['rating'].clip(0, 5)
+    standardize_numbers(df)
 
     # 4. Standardize categorical fields
     if 'availability' in df.columns:
-        df['availability_standardized'] = df['availability'].apply(standardize_availability)
+        df['availability_standardized'] = standardize_availability_series(df['availability'])
     
     # 5. Date/time standardization
     if 'scraped_at' in df.columns:
         df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
+    return df
+
+def add_sentiment(df, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None):
+    """Scores description_clean into a sentiment_score column right after it"""
+    scores = score_sentiments(df['description_clean'], sentiment_cache_path, workers)
+    df.insert(df.columns.get_loc('description_clean') + 1, 'sentiment_score', scores)
+
+def standardize_numbers(df):
+    df['price'] = pd.to_numeric(df['price'], errors='coerce')
+    df['rating'] = convert_rating_series(df['rating'])
+    
+    # Ensure rating is between 0-5
+    df['rating'] = df['rating'].clip(0, 5)
 
-    # 6. Handle missing data strategically
-    missing_before = df.isnull().sum().sum()
+def price_categories(prices):
+    return pd.cut(prices,
+                  bins=[0, 10, 25, 50, 100, float('inf')],
+                  labels=ORDERED_CATEGORIES['price_category'])
+
+def add_features(df):
+    # 8. Create additional features
+    df['price_category'] = price_categories(df['price'])
     
+    df['rating_category'] = pd.cut(df['rating'],
+                                  bins=[0, 1, 2, 3, 4, 5],
+                                  labels=ORDERED_CATEGORIES['rating_category'])
+    return df
+
+def clean_partition(df, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None, sentiment=True):
+    """Preprocesses rows and drops those missing critical fields, which needs no other rows;
+    returns the cleaned rows and how many values were missing before dropping"""
+    df = preprocess_records(df, sentiment_cache_path, workers, sentiment)
+    missing = df.isnull().sum().sum()
     # Drop rows missing critical information
-    critical_columns = ['title', 'price']
-    df = df.dropna(subset=critical_columns)
+    return df.dropna(subset=CRITICAL_COLUMNS), missing
+
+def clean_partitions(df, partition_size, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None):
+    """clean_partition over consecutive slices of `partition_size` rows, in a pool of `workers`
+    processes, merged back in order
+
+    Sentiment is scored after merging, so a description repeated across
+    partitions is scored once; score_sentiments spreads the distinct texts
+    over the same number of processes.
+    """
+    workers = workers or os.cpu_count() or 1
+    partitions = [df.iloc[start:start + partition_size] for start in range(0, len(df), partition_size)]
+    if len(partitions) < 2:
+        return clean_partition(df, sentiment_cache_path, workers)
+
+    print(f"Cleaning {len(partitions)} partitions of up to {partition_size} rows in {workers} processes...")
+    if workers == 1:
+        results = [clean_partition(partition.copy(), sentiment=False) for partition in partitions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(clean_partition, partitions, repeat(None), repeat(1), repeat(False)))
+    df = pd.concat([frame for frame, _ in results])
+    if 'description_clean' in df.columns:
+        add_sentiment(df, sentiment_cache_path, workers)
+    return df, sum(missing for _, missing in results)
+
+def clean_frame(df, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None, partition_size=None):
+    """
+    Enhanced data cleaning pipeline with comprehensive preprocessing, on scraped data in memory
+
+    Sentiment scores are cached in `sentiment_cache_path` and computed by
+    `workers` processes. With `partition_size`, the deduplicated rows are
+    split into partitions of that many rows that `workers` processes clean
+    side by side; the steps that need every row (imputation, validation)
+    run on the merged result, which is the same as without partitions.
+    """
+    print("Starting comprehensive data cleaning...")
+    initial_count = len(df)
+
+    # 1. Handle duplicates
+    df = df.drop_duplicates(subset=DUPLICATE_KEY)
+    print(f"Removed {initial_count - len(df)} duplicate rows.")
+
+    # 2-5. Row-by-row cleaning, and 6. handle missing data strategically
+    if partition_size:
+        df, missing_before = clean_partitions(df, partition_size, sentiment_cache_path, workers)
+    else:
+        df, missing_before = clean_partition(df, sentiment_cache_path, workers)
     
     # For less critical columns, use appropriate imputation
     if 'rating' in df.columns:
-        df['rating'].fillna(df['rating'].median(), inplace=True)
+        df['rating'] = df['rating'].fillna(df['rating'].median())
     
     missing_after = df.isnull().sum().sum()
     print(f"Reduced missing values from {missing_before} to {missing_after}")
 
     # 7. Data validation
-    validation_issues = validate_data(df)
-    if validation_issues:
-        print("Validation issues found:")
-        for issue in validation_issues:
-            print(f"  - {issue}")
-    else:
-        print("Data validation passed successfully")
+    report_validation(validate_data(df))
 
-    # 8. Create additional features
-    df['price_category'] = pd.cut(df['price'], 
-                                 bins=[0, 10, 25, 50, 100, float('inf')],
-                                 labels=['Budget', 'Affordable', 'Mid-range', 'Premium', 'Luxury'])
-    
-    df['rating_category'] = pd.cut(df['rating'],
-                                  bins=[0, 1, 2, 3, 4, 5],
-                                  labels=['Very Poor', 'Poor', 'Average', 'Good', 'Excellent'])
+    df = add_features(df)
 
     print(f"Data cleaning complete. Final dataset: {len(df)} records")
+    return df
+
+def clean_data(input_file_path=DEFAULT_INPUT_PATH, output_file_path=DEFAULT_OUTPUT_PATH,
+               sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH, workers=None, partition_size=None):
+    """
+    Reads scraped data, cleans it with clean_frame and saves the result
+
+    Either path may be a CSV or Parquet file, or a Parquet dataset directory
+    partitioned by source and scrape date, which keeps the datetime and
+    categorical columns typed for the later stages.
+    """
+    print(f"Reading data from {input_file_path}...")
+
+    try:
+        # Prices keep full precision; they are written back out
+        df = load_table(input_file_path, downcast=False)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file_path}' was not found.")
+        return
+
+    df = clean_frame(df, sentiment_cache_path, workers, partition_size)
     
     # Save cleaned data
-    df.to_csv(output_file_path, index=False)
+    write_table(df, output_file_path)
     print(f"Cleaned data saved to {output_file_path}")
     
     return df
 
+def clean_data_chunked(input_file_path=DEFAULT_INPUT_PATH, output_file_path=DEFAULT_OUTPUT_PATH,
+                       chunksize=DEFAULT_CHUNKSIZE, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH,
+                       workers=None):
+    """
+    The clean_data pipeline for inputs too large for memory, `chunksize` rows at a time
+
+    A first pass reads only the key, price and rating columns to find the
+    rating median for imputation, approximately, with a streaming quantile
+    sketch. The second pass cleans each chunk and appends it to the output.
+    Duplicates are found across chunks by hashing the (title, source) key,
+    so memory grows by 8 bytes per distinct product and otherwise only with
+    `chunksize`. Prices and ratings are always written as floats, so that
+    every chunk has the same types; clean_data writes whole numbers when
+    a column has nothing else. Returns the number of records written.
+    """
+    print(f"Reading data from {input_file_path} in chunks of {chunksize} rows...")
+    if not os.path.exists(input_file_path):
+        print(f"Error: The file '{input_file_path}' was not found.")
+        return
+
+    # Pass 1: the rating median over the rows that will be kept
+    seen = SeenRows(DUPLICATE_KEY)
+    ratings = StreamingQuantiles()
+    for chunk in iter_table(input_file_path, chunksize, DUPLICATE_KEY + ['price', 'rating'], TEXT_DTYPES):
+        chunk = chunk[seen.first_occurrences(chunk)]
+        if chunk.empty or 'rating' not in chunk.columns:
+            continue
+        standardize_numbers(chunk)
+        ratings.update(chunk.dropna(subset=CRITICAL_COLUMNS)['rating'])
+    rating_median = ratings.median()
+    print(f"Approximate rating median for imputation: {rating_median}")
+
+    # Pass 2: clean and append each chunk
+    print("Starting comprehensive data cleaning...")
+    seen = SeenRows(DUPLICATE_KEY)
+    totals = {'read': 0, 'duplicates': 0, 'missing_before': 0, 'missing_after': 0}
+    issue_counts = {}
+    with TableWriter(output_file_path) as writer:
+        for number, chunk in enumerate(iter_table(input_file_path, chunksize, dtype=TEXT_DTYPES), 1):
+            totals['read'] += len(chunk)
+            first = seen.first_occurrences(chunk)
+            totals['duplicates'] += int((~first).sum())
+            chunk = chunk[first].copy()
+            if chunk.empty:
+                continue
+
+            chunk = preprocess_records(chunk, sentiment_cache_path, workers)
+            totals['missing_before'] += chunk.isnull().sum().sum()
+            chunk = chunk.dropna(subset=CRITICAL_COLUMNS)
+            if 'rating' in chunk.columns:
+                chunk['rating'] = chunk['rating'].fillna(rating_median)
+            totals['missing_after'] += chunk.isnull().sum().sum()
+            for issue, count in count_validation_issues(chunk).items():
+                issue_counts[issue] = issue_counts.get(issue, 0) + count
+
+            # A chunk of whole numbers would otherwise be typed differently from the rest
+            chunk = chunk.astype({column: float for column in ['price', 'rating'] if column in chunk.columns})
+            writer.write(add_features(chunk))
+            print(f"Cleaned chunk {number}: {writer.rows} records written so far")
+
+    print(f"Removed {totals['duplicates']} duplicate rows.")
+    print(f"Reduced missing values from {totals['missing_before']} to {totals['missing_after']}")
+    report_validation(format_issues(issue_counts))
+    print(f"Data cleaning complete. Final dataset: {writer.rows} records")
+    print(f"Cleaned data saved to {output_file_path}")
+    return writer.rows
+
+def default_manifest_path(output_file_path):
+    return os.path.splitext(output_file_path.rstrip('/\\'))[0] + '.manifest.parquet'
+
+def key_hashes(df):
+    """64-bit hash of each row's (title, source) key"""
+    # Hash the text form, so a column parsed as numbers in one run and strings in another still matches
+    return pd.util.hash_pandas_object(df[DUPLICATE_KEY].astype(str), index=False).to_numpy()
+
+def content_hashes(df):
+    """64-bit hash of each row's scraped content (every column but the scrape time)"""
+    content_columns = [column for column in df.columns if column not in FINGERPRINT_EXCLUDED_COLUMNS]
+    return pd.util.hash_pandas_object(df[content_columns].astype(str), index=False).to_numpy()
+
+def clean_data_incremental(input_file_path=DEFAULT_INPUT_PATH, output_file_path=DEFAULT_OUTPUT_PATH,
+                           manifest_path=None, sentiment_cache_path=DEFAULT_SENTIMENT_CACHE_PATH,
+                           workers=None):
+    """
+    The clean_data pipeline, re-cleaning only the rows that changed since the last run
+
+    A manifest (next to the output by default) records a fingerprint of
+    every input row that was cleaned. Rows whose (title, source) key is
+    new, or whose content changed, are cleaned and merged into the existing
+    output; rows that left the input are dropped from it. Cleaning and
+    scoring time scales with the number of changed rows, and the output
+    matches what clean_data would write. Without a manifest or output
+    everything is cleaned. Near-duplicate clusters from near_duplicates.py
+    are dropped from the reused rows, as they were found among the old
+    rows; run it again on the output to recompute them.
+    """
+    manifest_path = manifest_path or default_manifest_path(output_file_path)
+    print(f"Reading data from {input_file_path}...")
+
+    try:
+        raw = load_table(input_file_path, downcast=False)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file_path}' was not found.")
+        return
+
+    initial_count = len(raw)
+    raw = raw.drop_duplicates(subset=DUPLICATE_KEY).reset_index(drop=True)
+    print(f"Removed {initial_count - len(raw)} duplicate rows.")
+    keys = pd.Index(key_hashes(raw))
+    content = content_hashes(raw)
+
+    changed = np.ones(len(raw), dtype=bool)
+    existing = None
+    if os.path.exists(manifest_path) and os.path.exists(output_file_path):
+        manifest = pd.read_parquet(manifest_path)
+        positions = pd.Index(manifest['key'].to_numpy()).get_indexer(keys)
+        previous = manifest['content'].to_numpy()[positions]
+        changed = (positions < 0) | (previous != content)
+        # A dataset's scrape_date partition is derived from scraped_at again on writing
+        existing = read_table(output_file_path).drop(columns=['scrape_date'] + CLUSTER_COLUMNS, errors='ignore')
+    else:
+        print("No manifest from an earlier run; cleaning every row")
+    print(f"{int(changed.sum())} new or changed rows of {len(raw)}")
+
+    new_rows = preprocess_records(raw[changed].copy(), sentiment_cache_path, workers)
+    new_rows = add_features(new_rows.dropna(subset=CRITICAL_COLUMNS))
+    if existing is not None and len(existing):
+        # Keep earlier results only for rows that are still in the input, unchanged
+        existing = existing[keys[~changed].get_indexer(key_hashes(existing)) >= 0]
+        print(f"Reused {len(existing)} cleaned rows from {output_file_path}")
+        df = pd.concat([existing, new_rows], ignore_index=True)
+    else:
+        df = new_rows
+
+    # Back into input order, as clean_data would write them
+    order = keys.get_indexer(key_hashes(df))
+    df = df.iloc[np.argsort(order, kind='stable')].reset_index(drop=True)
+    if 'scraped_at' in df.columns:
+        # Unchanged rows were still seen in this scrape
+        df['scraped_at'] = pd.to_datetime(raw['scraped_at'].iloc[np.sort(order)].to_numpy(), errors='coerce')
+
+    if 'rating' in df.columns:
+        df['rating'] = df['rating'].fillna(df['rating'].median())
+    report_validation(validate_data(df))
+    print(f"Data cleaning complete. Final dataset: {len(df)} records")
+
+    write_table(df, output_file_path)
+    pd.DataFrame({'key': keys.to_numpy(), 'content': content}).to_parquet(manifest_path, index=False)
+    print(f"Cleaned data saved to {output_file_path} (manifest {manifest_path})")
+    return df
+
 if __name__ == "__main__":
-    clean_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Clean the scraped product data")
+    parser.add_argument('--input', metavar='PATH', default=DEFAULT_INPUT_PATH,
+                        help="scraped data: .csv or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--output', metavar='PATH', default=DEFAULT_OUTPUT_PATH,
+                        help="cleaned data: .csv or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--sentiment-cache', metavar='PATH', default=DEFAULT_SENTIMENT_CACHE_PATH,
+                        help="SQLite file caching sentiment scores between runs")
+    parser.add_argument('--no-sentiment-cache', action='store_true',
+                        help="score every description without reading or writing the cache")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes used for sentiment scoring, or with --partition-size for cleaning "
+                             "partitions (default: one per CPU)")
+    parser.add_argument('--partition-size', type=int, default=None,
+                        help=f"clean the input in partitions of this many rows in parallel processes "
+                             f"(e.g. {DEFAULT_PARTITION_SIZE})")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f"stream the input this many rows at a time, for data larger than memory "
+                             f"(e.g. {DEFAULT_CHUNKSIZE})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only clean rows that are new or changed since the last run, merging them "
+                             "into the existing output")
+    parser.add_argument('--manifest', metavar='PATH', default=None,
+                        help="row fingerprints kept by --incremental (default: next to the output)")
+    args = parser.parse_args()
+    if sum(bool(mode) for mode in (args.incremental, args.chunksize, args.partition_size)) > 1:
+        parser.error("--incremental, --chunksize and --partition-size cannot be combined")
+    sentiment_cache_path = None if args.no_sentiment_cache else args.sentiment_cache
+    if args.incremental:
+        clean_data_incremental(args.input, args.output, args.manifest, sentiment_cache_path, args.workers)
+    elif args.chunksize:
+        clean_data_chunked(args.input, args.output, args.chunksize, sentiment_cache_path, args.workers)
+    else:
+        clean_data(args.input, args.output, sentiment_cache_path=sentiment_cache_path, workers=args.workers,
+                   partition_size=args.partition_size)
\ No newline at end of file
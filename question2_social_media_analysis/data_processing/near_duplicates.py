@@ -0,0 +1,224 @@
+# question2_social_media_analysis/data_processing/near_duplicates.py
+
+import os
+import re
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+from storage import read_table, write_table  # noqa: E402
+
+DEFAULT_PATH = os.path.join(CURRENT_DIR, 'cleaned_products.csv')
+
+# Columns add_duplicate_clusters adds; they describe the whole dataset, so they go stale when rows change
+CLUSTER_COLUMNS = ['duplicate_cluster', 'duplicate_cluster_size']
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 4
+# Signature value of a title without shingles
+EMPTY_SIGNATURE = np.iinfo(np.uint32).max
+# Titles in a bucket each title is compared with; larger buckets are compared within a sliding window
+BUCKET_WINDOW = 50
+# Titles whose signatures are computed, or candidate pairs compared, at a time, bounding memory to
+# about this many x num_perm values
+SIGNATURE_BATCH = 20_000
+NUMBER = re.compile(r'\d+')
+
+def title_shingles(title, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Character shingles of a title; a title shorter than a shingle is one shingle, an empty one has none"""
+    if not title:
+        return set()
+    return {title[i:i + shingle_size] for i in range(max(1, len(title) - shingle_size + 1))}
+
+def shingle_hashes(titles, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Hashes of every character shingle of each title, flattened, with the title each belongs to"""
+    shingles, owners = [], []
+    for position, title in enumerate(titles):
+        grams = title_shingles(title, shingle_size)
+        shingles.extend(grams)
+        owners.extend([position] * len(grams))
+    hashes = pd.util.hash_array(np.array(shingles, dtype=object)) & np.uint64(0xFFFFFFFF)
+    return hashes, np.array(owners, dtype=np.int64)
+
+def minhash_signatures(titles, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+    """num_perm MinHash values per title; the share of equal values estimates the Jaccard similarity
+
+    Each permutation is a multiply-shift hash, (a * x + b) mod 2^64 >> 32,
+    of the 32-bit shingle hashes, which needs no modulo arithmetic.
+    """
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)[:, None]
+    signatures = np.full((len(titles), num_perm), EMPTY_SIGNATURE, dtype=np.uint32)
+
+    for start in range(0, len(titles), SIGNATURE_BATCH):
+        hashes, owners = shingle_hashes(titles[start:start + SIGNATURE_BATCH], shingle_size)
+        if len(hashes) == 0:
+            continue
+        # Owners are ascending, so each title's shingles are one contiguous run
+        run_starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+        permuted = ((a * hashes + b) >> np.uint64(32)).astype(np.uint32)
+        signatures[start + owners[run_starts]] = np.minimum.reduceat(permuted, run_starts, axis=1).T
+    return signatures
+
+def lsh_parameters(threshold, num_perm=DEFAULT_NUM_PERM):
+    """Bands and rows per band whose S-curve midpoint (1/bands)^(1/rows) is the highest not above `threshold`
+
+    Candidates are confirmed exactly afterwards, so pairs just above the
+    threshold are better found at the cost of some extra candidates.
+    """
+    candidates = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    below = [option for option in candidates if (1 / option[0]) ** (1 / option[1]) <= threshold]
+    return max(below or candidates[-1:], key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+def candidate_pairs(signatures, bands, rows, window=BUCKET_WINDOW):
+    """Pairs of titles sharing a whole band of their signature, found by hashing bands into buckets
+
+    Every pair of titles in a bucket is a candidate, except in buckets of
+    more than `window` titles, where each title is paired only with the
+    `window - 1` titles before it (in row order). Such buckets hold many
+    mutually similar titles, such as the volumes of a series; the window
+    bounds the work to O(titles x window) per band, at the cost of
+    possibly missing links between titles far apart in a very large bucket.
+    """
+    pairs = []
+    has_shingles = signatures[:, 0] != EMPTY_SIGNATURE
+    for band in range(bands):
+        keys = pd.util.hash_pandas_object(pd.DataFrame(signatures[:, band * rows:(band + 1) * rows]),
+                                          index=False).to_numpy()
+        members = np.flatnonzero(has_shingles)
+        members = members[np.argsort(keys[members], kind='stable')]
+        sorted_keys = keys[members]
+        # Buckets are contiguous, so once no title has a bucket mate `offset` places on, none has further on
+        for offset in range(1, window):
+            same_bucket = sorted_keys[offset:] == sorted_keys[:-offset]
+            if not same_bucket.any():
+                break
+            pairs.append(np.column_stack([members[:-offset], members[offset:]])[same_bucket])
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    # Each pair as one integer, first * titles + second, de-duplicated by sorting
+    pairs = np.concatenate(pairs).astype(np.int64)
+    encoded = np.sort(pairs[:, 0] * len(signatures) + pairs[:, 1])
+    encoded = encoded[np.r_[True, encoded[1:] != encoded[:-1]]]
+    return np.column_stack([encoded // len(signatures), encoded % len(signatures)])
+
+def confirmed_pairs(titles, signatures, pairs, threshold, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """The candidate pairs that are near duplicates, with their similarity
+
+    Both titles must contain the same numbers, so that the numbered
+    variants of a product (models, volumes, sizes) stay apart however
+    much text they share, and their Jaccard similarity must be at least
+    `threshold`. The signatures' estimate of it is used where it is more
+    than three standard errors from the threshold, and the similarity of
+    the titles' shingle sets is computed exactly for the pairs in between.
+    """
+    numbers, _ = pd.factorize(pd.Series([' '.join(sorted(set(NUMBER.findall(title)))) for title in titles]))
+    pairs = pairs[numbers[pairs[:, 0]] == numbers[pairs[:, 1]]]
+    margin = 3 * np.sqrt(threshold * (1 - threshold) / signatures.shape[1])
+    estimate = np.empty(len(pairs))
+    for start in range(0, len(pairs), SIGNATURE_BATCH):
+        batch = pairs[start:start + SIGNATURE_BATCH]
+        estimate[start:start + SIGNATURE_BATCH] = (signatures[batch[:, 0]] == signatures[batch[:, 1]]).mean(axis=1)
+    keep = estimate >= threshold - margin
+    pairs, similarity = pairs[keep], estimate[keep]
+
+    close = similarity < threshold + margin
+    shingles = {position: title_shingles(titles[position], shingle_size)
+                for position in np.unique(pairs[close]).tolist()}
+    sizes = np.zeros(len(titles))
+    sizes[list(shingles)] = [len(grams) for grams in shingles.values()]
+    firsts, seconds = (map(shingles.__getitem__, column.tolist()) for column in pairs[close].T)
+    common = np.fromiter(map(len, map(set.intersection, firsts, seconds)), dtype=float, count=int(close.sum()))
+    similarity[close] = common / (sizes[pairs[close, 0]] + sizes[pairs[close, 1]] - common)
+    keep = similarity >= threshold
+    return pairs[keep], similarity[keep]
+
+def representative_clusters(count, pairs, similarity):
+    """Cluster number of each of `count` titles from their near-duplicate pairs (first < second)
+
+    Titles are taken in order; each joins the cluster of the most similar
+    earlier title that represents one, or else represents a new cluster.
+    Every member is thus a near duplicate of its cluster's representative,
+    rather than only linked to it through a chain of near duplicates.
+    """
+    representative = list(range(count))
+    for first, second in pairs[np.lexsort((-similarity, pairs[:, 1]))].tolist():
+        if representative[second] == second and representative[first] == first:
+            representative[second] = first
+    return pd.factorize(np.array(representative, dtype=np.int64))[0]
+
+def near_duplicate_clusters(titles, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                            shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+    """Cluster id for each title; a cluster is a title and the later titles that are its near
+    duplicates (see confirmed_pairs), and a missing or empty title is a cluster of its own"""
+    titles = pd.Series(titles)
+    # Empty titles count as missing, which factorize leaves out with code -1
+    codes, uniques = pd.factorize(titles.where(titles.fillna('').astype(str) != ''))
+    unique_titles = [str(title) for title in uniques]
+    signatures = minhash_signatures(unique_titles, num_perm, shingle_size, seed)
+
+    bands, rows = lsh_parameters(threshold, num_perm)
+    pairs, similarity = confirmed_pairs(unique_titles, signatures, candidate_pairs(signatures, bands, rows),
+                                        threshold, shingle_size)
+    labels = representative_clusters(len(unique_titles), pairs, similarity)
+    missing = codes < 0
+    row_labels = np.empty(len(codes), dtype=np.int64)
+    row_labels[~missing] = labels[codes[~missing]]
+    row_labels[missing] = len(unique_titles) + np.arange(missing.sum())
+    return pd.Series(row_labels, index=titles.index, name='duplicate_cluster')
+
+def add_duplicate_clusters(df, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                           shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Adds duplicate_cluster (over title_clean) and duplicate_cluster_size columns"""
+    df['duplicate_cluster'] = near_duplicate_clusters(df['title_clean'], threshold, num_perm, shingle_size)
+    df['duplicate_cluster_size'] = df.groupby('duplicate_cluster')['duplicate_cluster'].transform('size')
+    return df
+
+def find_near_duplicates(input_file_path=DEFAULT_PATH, output_file_path=None, threshold=DEFAULT_THRESHOLD,
+                         num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """Adds near-duplicate cluster ids to cleaned data, writing it back in place unless `output_file_path`"""
+    print(f"Reading cleaned data from {input_file_path}...")
+    try:
+        df = read_table(input_file_path)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file_path}' was not found.")
+        return
+    if 'title_clean' not in df.columns:
+        print("Error: near-duplicate detection needs the title_clean column from data_cleaner.py")
+        return
+    df = df.drop(columns=['scrape_date'], errors='ignore')
+
+    print(f"Finding near-duplicate titles (threshold {threshold}, {num_perm} permutations, "
+          f"bands x rows {lsh_parameters(threshold, num_perm)})...")
+    df = add_duplicate_clusters(df, threshold, num_perm, shingle_size)
+    clustered = df[df['duplicate_cluster_size'] > 1]
+    print(f"Found {clustered['duplicate_cluster'].nunique()} clusters covering {len(clustered)} of {len(df)} records")
+    if 'source' in df.columns:
+        cross_source = clustered.groupby('duplicate_cluster')['source'].nunique()
+        print(f"{int((cross_source > 1).sum())} clusters span more than one source")
+
+    output_file_path = output_file_path or input_file_path
+    write_table(df, output_file_path)
+    print(f"Data with duplicate clusters saved to {output_file_path}")
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Group near-duplicate products by MinHash/LSH over their titles")
+    parser.add_argument('--input', metavar='PATH', default=DEFAULT_PATH,
+                        help="cleaned data: .csv or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--output', metavar='PATH', default=None, help="where to write (default: the input)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Jaccard similarity of title shingles at which products are near duplicates")
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM, help="MinHash permutations per title")
+    parser.add_argument('--shingle-size', type=int, default=DEFAULT_SHINGLE_SIZE,
+                        help="characters per title shingle")
+    args = parser.parse_args()
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+    find_near_duplicates(args.input, args.output, args.threshold, args.num_perm, args.shingle_size)
@@ -0,0 +1,66 @@
+# question2_social_media_analysis/data_processing/sentiment_cache.py
+
+import hashlib
+import sqlite3
+import threading
+
+# Rows per query when looking up or storing many scores at once
+BATCH_SIZE = 500
+
+class SentimentCache:
+    """Persistent sentiment scores keyed by a hash of the scorer and the text, backed by a SQLite file.
+
+    `model` names the scorer (including its version), so scores from a
+    different scorer are never served; they are simply missed and replaced.
+    """
+
+    def __init__(self, path, model):
+        self.path = path
+        self.model = model
+        self.lock = threading.Lock()
+        # Processes cleaning partitions in parallel may write at the same time
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS sentiment (
+                key TEXT PRIMARY KEY,
+                score REAL NOT NULL
+            )""")
+        self.conn.commit()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts):
+        """Returns {text: score} for the texts that are cached"""
+        keys = {self.key(text): text for text in texts}
+        found = {}
+        key_list = list(keys)
+        with self.lock:
+            for start in range(0, len(key_list), BATCH_SIZE):
+                batch = key_list[start:start + BATCH_SIZE]
+                rows = self.conn.execute(
+                    f"SELECT key, score FROM sentiment WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update((keys[key], score) for key, score in rows)
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def put_many(self, scores):
+        """Stores {text: score}"""
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO sentiment VALUES (?, ?)",
+                                  ((self.key(text), score) for text, score in scores.items()))
+            self.conn.commit()
+
+    def summary(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(self.stats, entries=entries,
+                        hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else 0.0)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,100 @@
+# question2_social_media_analysis/data_processing/streaming.py
+
+import numpy as np
+import pandas as pd
+
+class SeenRows:
+    """Remembers which rows have been seen, by 64-bit hash of their key columns.
+
+    Hashes are kept in sorted numpy runs (8 bytes per distinct row); runs
+    of similar size are merged, so lookups stay logarithmic. Two distinct
+    keys share a hash with probability about n^2 / 2^65, which is
+    negligible at the sizes we scrape.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def _seen(self, hashes):
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            if run.size == 0:
+                continue
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            seen |= run[positions] == hashes
+        return seen
+
+    def first_occurrences(self, df):
+        """Boolean mask of the rows of `df` whose key has not been seen before, and records them"""
+        if df.empty:
+            return np.zeros(0, dtype=bool)
+        hashes = pd.util.hash_pandas_object(df[self.columns], index=False).to_numpy()
+        first_in_chunk = np.zeros(len(hashes), dtype=bool)
+        first_in_chunk[np.unique(hashes, return_index=True)[1]] = True
+        new = first_in_chunk & ~self._seen(hashes)
+
+        run = np.sort(hashes[new])
+        if run.size == 0:
+            # A chunk of rows seen before adds nothing to remember
+            return new
+        # Merge while the newest run is at least as large as the one before it
+        while self.runs and len(self.runs[-1]) <= len(run):
+            run = np.union1d(self.runs.pop(), run)
+        self.runs.append(run)
+        return new
+
+class StreamingQuantiles:
+    """Approximate quantiles of a numeric stream in bounded memory (a KLL-style compactor sketch).
+
+    Values are buffered at level 0; a level that outgrows its capacity is
+    sorted and every other value (from a random offset) is promoted to the
+    next level with twice the weight. Memory is O(k) whatever the stream
+    length, and rank error is roughly 1/k.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.random = np.random.default_rng(seed)
+        self.levels = [np.empty(0)]
+        self.count = 0
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd value out stays behind so total weight is preserved
+                leftover, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+                promoted = items[self.random.integers(0, 2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = leftover
+            level += 1
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1) of everything seen, or NaN if nothing was"""
+        values = np.concatenate(self.levels)
+        if len(values) == 0:
+            return float('nan')
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(values[order][min(index, len(values) - 1)])
+
+    def median(self):
+        return self.quantile(0.5)
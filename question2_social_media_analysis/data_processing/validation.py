@@ -0,0 +1,107 @@
+# question2_social_media_analysis/data_processing/validation.py
+
+import numpy as np
+import pandas as pd
+
+class Rule:
+    """A named check over some columns; `failing(df)` returns a boolean array marking rows that break it"""
+
+    def __init__(self, name, columns, failing):
+        self.name = name
+        self.columns = columns
+        self.failing = failing
+
+    def applies_to(self, df):
+        return all(column in df.columns for column in self.columns)
+
+def _mask(values):
+    """A plain numpy boolean array, with missing results counted as passing"""
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=bool, na_value=False)
+    return np.asarray(values, dtype=bool)
+
+def _per_value(series, check):
+    """Applies `check` (Series -> boolean Series of failures) to a column; for a categorical,
+    once per category rather than once per row"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        failing = _mask(check(pd.Series(series.cat.categories)))
+        # Code -1 is a missing value, which only not_null rules fail
+        return np.append(failing, False)[series.cat.codes.to_numpy()]
+    return _mask(check(series))
+
+def in_range(name, column, min_value=None, max_value=None, min_inclusive=True, max_inclusive=True):
+    """Values must lie between the bounds; missing values pass (see not_null)"""
+    def failing(df):
+        values = df[column]
+        mask = np.zeros(len(df), dtype=bool)
+        if min_value is not None:
+            mask |= _mask((values < min_value) if min_inclusive else (values <= min_value))
+        if max_value is not None:
+            mask |= _mask((values > max_value) if max_inclusive else (values >= max_value))
+        return mask
+    return Rule(name, [column], failing)
+
+def not_null(name, column, allow_empty=False):
+    """Values must be present, and unless `allow_empty`, not the empty string"""
+    def failing(df):
+        values = df[column]
+        mask = _mask(values.isna())
+        if not allow_empty and not pd.api.types.is_numeric_dtype(values) \
+                and not pd.api.types.is_datetime64_any_dtype(values):
+            mask = mask | _per_value(values, lambda v: v.astype(str).eq('') & v.notna())
+        return mask
+    return Rule(name, [column], failing)
+
+def matches(name, column, pattern):
+    """Text values must fully match the regular expression; missing values pass"""
+    def failing(df):
+        return _per_value(df[column], lambda v: ~v.astype(str).str.fullmatch(pattern) & v.notna())
+    return Rule(name, [column], failing)
+
+def allowed_values(name, column, values):
+    """Values must be one of `values`; missing values pass"""
+    allowed = list(values)
+
+    def failing(df):
+        return _per_value(df[column], lambda v: ~v.isin(allowed) & v.notna())
+    return Rule(name, [column], failing)
+
+def cross_field(name, columns, check):
+    """Rows where `check(df)` is False fail; `check` returns a boolean Series or array over the rows,
+    in which missing results pass"""
+    def failing(df):
+        return _mask(~pd.Series(check(df)).astype('boolean'))
+    return Rule(name, columns, failing)
+
+def format_issues(counts):
+    """One message per rule that some records fail"""
+    return [f"Found {count} records with {name}" for name, count in counts.items() if count > 0]
+
+class ValidationReport:
+    """Per-rule failure counts and positions of the offending rows"""
+
+    def __init__(self, rows, skipped):
+        # rule name -> positions (not index labels) of failing rows, as an int array
+        self.rows = rows
+        self.skipped = skipped
+
+    @property
+    def counts(self):
+        return {name: len(positions) for name, positions in self.rows.items()}
+
+    def issues(self):
+        return format_issues(self.counts)
+
+    def failing(self, df, name):
+        """The offending rows of `df` for one rule"""
+        return df.iloc[self.rows[name]]
+
+def validate(df, rules):
+    """Evaluates every rule as a boolean mask over `df`; rules on columns `df` lacks are skipped"""
+    rows, skipped = {}, []
+    for rule in rules:
+        if not rule.applies_to(df):
+            skipped.append(rule.name)
+            continue
+        rows[rule.name] = np.flatnonzero(rule.failing(df))
+    return ValidationReport(rows, skipped)
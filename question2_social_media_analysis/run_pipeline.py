@@ -0,0 +1,264 @@
+# question2_social_media_analysis/run_pipeline.py
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+for stage_dir in ['data_collection', 'data_processing', 'analysis', 'visualizations']:
+    sys.path.insert(0, os.path.join(CURRENT_DIR, stage_dir))
+
+import scraper  # noqa: E402
+import storage  # noqa: E402
+import data_cleaner  # noqa: E402
+import validation  # noqa: E402
+import near_duplicates  # noqa: E402
+import aggregation  # noqa: E402
+import analysis  # noqa: E402
+import recommendation  # noqa: E402
+import visualizer  # noqa: E402
+
+DEFAULT_CACHE_DIR = os.path.join(CURRENT_DIR, '.pipeline_cache')
+DEFAULT_FIGURES_DIR = os.path.join(CURRENT_DIR, 'visualizations')
+
+def frame_fingerprint(df):
+    """Hash of a DataFrame's columns, dtypes and values"""
+    digest = hashlib.sha256()
+    for column in df.columns:
+        digest.update(f"{column}\0{df[column].dtype}\0".encode('utf-8'))
+        try:
+            hashes = pd.util.hash_pandas_object(df[column], index=False)
+        except TypeError:
+            # Unhashable values such as the hashtag lists are hashed by their repr
+            hashes = pd.util.hash_pandas_object(df[column].map(repr), index=False)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+def code_fingerprint(*modules):
+    """Hash of the source files of the modules a stage runs, so editing them invalidates its cache"""
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def stage_key(stage, input_fingerprint, code, params=None):
+    """Cache key of one run of a stage: a hash of its input, code and parameters"""
+    identity = {'stage': stage, 'input': input_fingerprint, 'code': code, 'params': params or {}}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class StageCache:
+    """Stage outputs on disk, each under <directory>/<stage>/<key>/
+
+    An entry is a DataFrame (output.parquet), captured text (output.txt)
+    or a list of files the stage wrote elsewhere, plus meta.json, which is
+    written last, so an interrupted stage leaves no entry behind.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def _entry(self, stage, key):
+        return os.path.join(self.directory, stage, key)
+
+    def load(self, stage, key):
+        """The entry's metadata, or None if the stage has not run with this key"""
+        meta_path = os.path.join(self._entry(stage, key), 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if not all(os.path.exists(path) for path in meta.get('files', [])):
+            return None
+        return meta
+
+    def save(self, stage, key, meta, frame=None, text=None):
+        entry = self._entry(stage, key)
+        # Older entries of the same stage are superseded
+        shutil.rmtree(os.path.join(self.directory, stage), ignore_errors=True)
+        os.makedirs(entry)
+        if frame is not None:
+            frame.to_parquet(os.path.join(entry, 'output.parquet'), index=False)
+        if text is not None:
+            with open(os.path.join(entry, 'output.txt'), 'w', encoding='utf-8') as f:
+                f.write(text)
+        with open(os.path.join(entry, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    def frame(self, stage, key):
+        return pd.read_parquet(os.path.join(self._entry(stage, key), 'output.parquet'))
+
+    def text(self, stage, key):
+        with open(os.path.join(self._entry(stage, key), 'output.txt'), encoding='utf-8') as f:
+            return f.read()
+
+@contextlib.contextmanager
+def _tee_stdout():
+    """Captures what is printed while still showing it"""
+    buffer = io.StringIO()
+    target = sys.stdout
+
+    class Tee(io.TextIOBase):
+        def write(self, text):
+            buffer.write(text)
+            return target.write(text)
+
+    with contextlib.redirect_stdout(Tee()):
+        yield buffer
+
+@contextlib.contextmanager
+def _working_directory(path):
+    previous = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def _stage_frame(df, columns):
+    """The columns a stage reads, typed and indexed as load_table would give them"""
+    df = df[[column for column in columns if column in df.columns]].reset_index(drop=True)
+    return storage.optimize_dtypes(df)
+
+def run_pipeline(input_file_path=data_cleaner.DEFAULT_INPUT_PATH, scrape=False, output_file_path=None,
+                 cache_dir=DEFAULT_CACHE_DIR, figures_dir=DEFAULT_FIGURES_DIR, force=False,
+                 sentiment_cache_path=data_cleaner.DEFAULT_SENTIMENT_CACHE_PATH, workers=None,
+                 partition_size=None, duplicate_threshold=near_duplicates.DEFAULT_THRESHOLD,
+                 num_perm=near_duplicates.DEFAULT_NUM_PERM, shingle_size=near_duplicates.DEFAULT_SHINGLE_SIZE):
+    """
+    Runs scrape -> clean -> near-duplicate clusters -> analyse -> visualize in one process
+
+    DataFrames are handed from stage to stage in memory. Each later stage
+    is keyed by a hash of its input data, its parameters and its source
+    code; when a stage has already run with the same key its cached output
+    is reused (the cleaned frame, the duplicate clusters, the analysis
+    report, the figures) instead of running it again, unless `force`.
+    Scraping always runs when asked for, as its input is the web; the
+    scraped data is written to `input_file_path` as usual.
+    """
+    cache = StageCache(cache_dir)
+    timings = {}
+
+    # 1. Scraped data
+    start = time.perf_counter()
+    if scrape:
+        scraper.scrape_all_sources(output_path=input_file_path)
+    print(f"Reading scraped data from {input_file_path}...")
+    try:
+        raw = storage.optimize_dtypes(storage.read_table(input_file_path), downcast=False)
+    except FileNotFoundError:
+        print(f"Error: The file '{input_file_path}' was not found.")
+        return None
+    timings['scrape' if scrape else 'load'] = time.perf_counter() - start
+
+    # 2. Cleaning (partitioning does not change the result, so it is not part of the key)
+    start = time.perf_counter()
+    key = stage_key('clean', frame_fingerprint(raw),
+                    code_fingerprint(data_cleaner, validation, storage),
+                    {'sentiment_model': data_cleaner.SENTIMENT_MODEL})
+    meta = None if force else cache.load('clean', key)
+    if meta is not None:
+        print("Cleaning skipped: input and code unchanged, using the cached cleaned data")
+        cleaned = cache.frame('clean', key)
+    else:
+        cleaned = data_cleaner.clean_frame(raw, sentiment_cache_path, workers, partition_size)
+        meta = {'fingerprint': frame_fingerprint(cleaned), 'records': len(cleaned)}
+        cache.save('clean', key, meta, frame=cleaned)
+    # Later stages are keyed by the cleaned data as first computed, whether or not it came from the cache
+    cleaned_fingerprint = meta['fingerprint']
+    timings['clean'] = time.perf_counter() - start
+
+    # 3. Near-duplicate clusters, cached as just the columns they add
+    start = time.perf_counter()
+    key = stage_key('near_duplicates', cleaned_fingerprint, code_fingerprint(near_duplicates),
+                    {'threshold': duplicate_threshold, 'num_perm': num_perm, 'shingle_size': shingle_size})
+    meta = None if force else cache.load('near_duplicates', key)
+    if meta is not None:
+        print("Near-duplicate detection skipped: cleaned data and code unchanged, using the cached clusters")
+        clusters = cache.frame('near_duplicates', key)
+        cleaned = cleaned.assign(**{column: clusters[column].to_numpy() for column in clusters.columns})
+    else:
+        print(f"Finding near-duplicate titles (threshold {duplicate_threshold}, {num_perm} permutations)...")
+        cleaned = near_duplicates.add_duplicate_clusters(cleaned, duplicate_threshold, num_perm, shingle_size)
+        meta = {'fingerprint': frame_fingerprint(cleaned),
+                'clusters': int(cleaned.loc[cleaned['duplicate_cluster_size'] > 1, 'duplicate_cluster'].nunique())}
+        cache.save('near_duplicates', key, meta, frame=cleaned[near_duplicates.CLUSTER_COLUMNS])
+    clustered_fingerprint = meta['fingerprint']
+    if output_file_path:
+        storage.write_table(cleaned, output_file_path)
+        print(f"Cleaned data saved to {output_file_path}")
+    timings['near_duplicates'] = time.perf_counter() - start
+
+    # 4. Analysis, whose output is its printed report
+    start = time.perf_counter()
+    key = stage_key('analyze', clustered_fingerprint, code_fingerprint(analysis, aggregation, recommendation, storage))
+    if not force and cache.load('analyze', key) is not None:
+        print("Analysis skipped: cleaned data and code unchanged, cached report follows")
+        print(cache.text('analyze', key), end='')
+    else:
+        with _tee_stdout() as report:
+            analysis.run_analyses(_stage_frame(cleaned, analysis.ANALYSIS_COLUMNS))
+        cache.save('analyze', key, {}, text=report.getvalue())
+    timings['analyze'] = time.perf_counter() - start
+
+    # 5. Visualizations, whose outputs are the files they write (the clusters are not drawn)
+    start = time.perf_counter()
+    figures_dir = os.path.abspath(figures_dir)
+    key = stage_key('visualize', cleaned_fingerprint, code_fingerprint(visualizer, storage),
+                    {'figures_dir': figures_dir})
+    meta = None if force else cache.load('visualize', key)
+    if meta is not None:
+        print(f"Visualizations skipped: cleaned data and code unchanged, {len(meta['files'])} figures "
+              f"already in {figures_dir}")
+    else:
+        before = time.time()
+        with _working_directory(figures_dir):
+            visualizer.render_visualizations(_stage_frame(cleaned, visualizer.VISUALIZATION_COLUMNS))
+        files = sorted(os.path.join(figures_dir, name) for name in os.listdir(figures_dir)
+                       if name.endswith(('.png', '.html'))
+                       and os.path.getmtime(os.path.join(figures_dir, name)) >= before - 1)
+        cache.save('visualize', key, {'files': files})
+    timings['visualize'] = time.perf_counter() - start
+
+    print("Pipeline complete: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items()))
+    return cleaned
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every stage in one process, skipping unchanged stages")
+    parser.add_argument('--input', metavar='PATH', default=data_cleaner.DEFAULT_INPUT_PATH,
+                        help="scraped data to clean: .csv, .jsonl or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--scrape', action='store_true', help="scrape every source into --input first")
+    parser.add_argument('--output', metavar='PATH', default=None,
+                        help="also save the cleaned data, with its duplicate clusters, here")
+    parser.add_argument('--cache-dir', metavar='PATH', default=DEFAULT_CACHE_DIR,
+                        help="where stage outputs are cached between runs")
+    parser.add_argument('--figures-dir', metavar='PATH', default=DEFAULT_FIGURES_DIR,
+                        help="where the visualizations are saved")
+    parser.add_argument('--force', action='store_true', help="run every stage even if its cached output is current")
+    parser.add_argument('--sentiment-cache', metavar='PATH', default=data_cleaner.DEFAULT_SENTIMENT_CACHE_PATH,
+                        help="SQLite file caching sentiment scores between runs")
+    parser.add_argument('--no-sentiment-cache', action='store_true',
+                        help="score every description without reading or writing the sentiment cache")
+    parser.add_argument('--workers', type=int, default=None, help="processes used for cleaning (default: one per CPU)")
+    parser.add_argument('--partition-size', type=int, default=None,
+                        help="clean in partitions of this many rows in parallel processes")
+    parser.add_argument('--duplicate-threshold', type=float, default=near_duplicates.DEFAULT_THRESHOLD,
+                        help="Jaccard similarity of title shingles at which products are near duplicates")
+    parser.add_argument('--num-perm', type=int, default=near_duplicates.DEFAULT_NUM_PERM,
+                        help="MinHash permutations per title")
+    parser.add_argument('--shingle-size', type=int, default=near_duplicates.DEFAULT_SHINGLE_SIZE,
+                        help="characters per title shingle")
+    args = parser.parse_args()
+    if not 0 < args.duplicate_threshold <= 1:
+        parser.error("--duplicate-threshold must be in (0, 1]")
+    run_pipeline(args.input, args.scrape, args.output, args.cache_dir, args.figures_dir, args.force,
+                 None if args.no_sentiment_cache else args.sentiment_cache, args.workers, args.partition_size,
+                 args.duplicate_threshold, args.num_perm, args.shingle_size)
@@ -0,0 +1,34 @@
+# question2_social_media_analysis/tests/test_near_duplicates.py
+
+import os
+import sys
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_processing'))
+
+from near_duplicates import near_duplicate_clusters  # noqa: E402
+
+def test_numbered_variants_stay_separate():
+    titles = [f'laptop model {number}' for number in range(1, 19)]
+    assert near_duplicate_clusters(titles).nunique() == len(titles)
+
+def test_near_duplicates_merge():
+    titles = ['sapiens a brief history of humankind', 'the great gatsby',
+              'sapiens: a brief history of humankind', 'the great gatsby!', 'sapiens a brief history of humankind.']
+    clusters = near_duplicate_clusters(titles).tolist()
+    assert clusters[0] == clusters[2] == clusters[4]
+    assert clusters[1] == clusters[3]
+    assert clusters[0] != clusters[1]
+
+def test_clusters_do_not_chain():
+    # Each title differs from the one before by a character, drifting ever further from the first
+    titles = ['abcdefghijklmnopqrstuvwxyzabcdefghijklmnop']
+    for position in range(5, 41, 6):
+        titles.append(titles[-1][:position] + '#' + titles[-1][position + 1:])
+    clusters = near_duplicate_clusters(titles).tolist()
+    assert clusters[0] == clusters[1]
+    assert clusters[2] != clusters[0]
+
+def test_missing_and_empty_titles_are_clusters_of_their_own():
+    clusters = near_duplicate_clusters(['the great gatsby', None, '', None]).tolist()
+    assert len(set(clusters)) == 4
@@ -0,0 +1,47 @@
+# question2_social_media_analysis/tests/test_streaming.py
+
+import os
+import sys
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_processing'))
+
+import data_cleaner  # noqa: E402
+from streaming import SeenRows  # noqa: E402
+
+def test_chunk_of_only_seen_rows_is_all_duplicates():
+    seen = SeenRows(['title'])
+    first = pd.DataFrame({'title': ['a', 'b', 'c']})
+    assert seen.first_occurrences(first).all()
+    assert not seen.first_occurrences(first).any()
+
+def test_chunks_after_a_repeated_chunk_are_still_checked():
+    seen = SeenRows(['title'])
+    seen.first_occurrences(pd.DataFrame({'title': ['a', 'b', 'c']}))
+    seen.first_occurrences(pd.DataFrame({'title': ['a', 'b', 'c']}))
+    mask = seen.first_occurrences(pd.DataFrame({'title': ['c', 'd', 'd']}))
+    assert list(mask) == [False, True, False]
+
+def test_chunked_cleaning_matches_clean_data_on_repeated_chunks(tmp_path):
+    scraped = pd.DataFrame({
+        'source': 'books_toscrape',
+        'title': [f'Book {i}' for i in range(30)],
+        'price': [10.0 + i for i in range(30)],
+        'category': ['Poetry', 'Travel', 'Music'] * 10,
+        'rating': ['One', 'Three', 'Five'] * 10,
+        'availability': 'In stock (5 available)',
+        'scraped_at': '2025-09-24T12:40:21',
+    })
+    # The same scrape appended twice more, so every chunk after the first three repeats earlier ones
+    input_path = tmp_path / 'history.csv'
+    pd.concat([scraped] * 3, ignore_index=True).to_csv(input_path, index=False)
+    data_cleaner.clean_data(str(input_path), str(tmp_path / 'expected.csv'), None)
+    expected = pd.read_csv(tmp_path / 'expected.csv')
+
+    records = data_cleaner.clean_data_chunked(str(input_path), str(tmp_path / 'chunked.csv'), 10, None)
+    actual = pd.read_csv(tmp_path / 'chunked.csv')
+    # The chunked rating median is approximate, so only the kept records and their prices are compared
+    assert records == len(expected)
+    assert list(actual['title']) == list(expected['title'])
+    assert list(actual['price']) == list(expected['price'])
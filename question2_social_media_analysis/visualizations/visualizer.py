@@ -7,6 +7,17 @@ import plotly.express as px
 import plotly.graph_objects as go
 import plotly.subplots as sp
 import os
+import sys
+import argparse
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_DIR, '..', 'data_collection'))
+
+from storage import load_table  # noqa: E402
+
+DEFAULT_INPUT_PATH = os.path.join(CURRENT_DIR, '..', 'data_processing', 'cleaned_products.csv')
+# The only cleaned columns the plots use; columnar inputs skip the rest
+VISUALIZATION_COLUMNS = ['source', 'title', 'price', 'rating', 'category', 'scraped_at', 'sentiment_score']
 
 def create_static_visualizations(df):
     """Create traditional matplotlib/seaborn visualizations"""
@@ -94,7 +105,7 @@ def create_comparative_analysis_plots(df):
         return
     
     # Comparative pricing analysis
-    source_price_stats = df.groupby('source').agg({
+    source_price_stats = df.groupby('source', observed=True).agg({
         'price': ['mean', 'median', 'std', 'count']
     }).round(2)
     
@@ -136,21 +147,22 @@ def create_advanced_visualizations(df):
                          yaxis_title='Sample Quantiles')
         fig.write_html('qq_plot_price_normality.html')
 
-def create_visualizations():
+def create_visualizations(input_file_path=DEFAULT_INPUT_PATH, report_memory=False):
     """
     Creates comprehensive static and interactive visualizations
     """
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    input_file_path = os.path.join(current_dir, '..', 'data_processing', 'cleaned_products.csv')
-
     print(f"Reading cleaned data from {input_file_path}...")
 
     try:
-        df = pd.read_csv(input_file_path)
+        df = load_table(input_file_path, columns=VISUALIZATION_COLUMNS, report=report_memory)
     except FileNotFoundError:
         print(f"Error: The file '{input_file_path}' was not found.")
         return
 
+    render_visualizations(df)
+
+def render_visualizations(df):
+    """Creates every plot of cleaned data in memory, saving them in the current directory"""
     print("Creating visualizations...")
     
     # Create static visualizations
@@ -172,4 +184,9 @@ def create_visualizations():
     print("All visualizations completed successfully!")
 
 if __name__ == "__main__":
-    create_visualizations()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Plot the cleaned product data")
+    parser.add_argument('--input', metavar='PATH', default=DEFAULT_INPUT_PATH,
+                        help="cleaned data: .csv or .parquet file, or a partitioned dataset directory")
+    parser.add_argument('--memory-report', action='store_true', help="print memory use per column after loading")
+    args = parser.parse_args()
+    create_visualizations(args.input, args.memory_report)
\ No newline at end of file